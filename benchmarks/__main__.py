@@ -0,0 +1,61 @@
+"""
+Run the benchmark suite, e.g.&colon;
+    `python -m benchmarks run --out benchmarks/baseline.json` to record a new baseline
+    `python -m benchmarks compare` to check for regressions against the baseline
+"""
+import argparse
+import json
+import sys
+from os import listdir
+from benchmarks.suite import compare, run_suite
+
+all_days = sorted(int(filename[4:-3]) for filename in listdir("days")
+                  if filename.startswith("day_") and filename.endswith(".py"))
+
+parser = argparse.ArgumentParser(description='Benchmark the AoC problem solutions.')
+subparsers = parser.add_subparsers(dest="command", required=True)
+run_parser = subparsers.add_parser("run", help="run the suite and save the results")
+run_parser.add_argument("--out", help="the file to save the results to",
+                        default="bench_output.json")
+compare_parser = subparsers.add_parser(
+    "compare", help="run the suite (or load saved results), and compare it to a baseline")
+compare_parser.add_argument("--baseline", help="the baseline results to compare against",
+                            default="benchmarks/baseline.json")
+compare_parser.add_argument("--results", help="compare saved results instead of running the "
+                            "suite again")
+compare_parser.add_argument("--threshold", help="flag benchmarks more than this percent slower "
+                            "than the baseline", type=float, default=10)
+compare_parser.add_argument("--noise", help="only flag slowdowns larger than this many standard "
+                            "deviations of the runs", type=float, default=3)
+for subparser in [run_parser, compare_parser]:
+    subparser.add_argument("-d", "--days", help="the days to benchmark", type=int, nargs="+",
+                           choices=all_days, default=all_days)
+    subparser.add_argument("-r", "--repeats", help="the number of times to run each benchmark",
+                           type=int, default=5)
+    subparser.add_argument("--no-micro", help="skip the utils.grid microbenchmarks",
+                           action="store_true")
+    subparser.add_argument("--search", help="also run the utils.grid_search benchmarks on "
+                           "mazes up to 2000x2000, which take a few minutes", action="store_true")
+args = parser.parse_args()
+
+if args.command == "compare" and args.results:
+    with open(args.results, "r", encoding="utf-8") as f:
+        current = json.load(f)
+else:
+    current = run_suite(args.days, args.repeats, not args.no_micro,
+                        search_benchmarks=args.search)
+
+if args.command == "run":
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"Saved results to {args.out}")
+else:
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, current, args.threshold / 100, args.noise)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) got slower than the baseline:")
+        for regression in regressions:
+            print(f"    {regression}")
+        sys.exit(1)
+    print("No benchmarks got slower than the baseline.")
@@ -0,0 +1,35 @@
+"""
+Seeded generators for synthetic AOC inputs, with one module per day.
+Every generator takes a scale factor, where the size of the input grows linearly with the scale
+and a scale of 1 is roughly the size of a real AOC input.
+"""
+import importlib
+
+def generate(day: int, scale: float = 1, seed: int = 0, **kwargs) -> str:
+    """
+    Generate an input for a given day
+
+    Args:
+        day: The day to generate an input for
+        scale: The size of the input, relative to a real AOC input
+        seed: The seed for the random number generator
+        **kwargs: Any day-specific options, see each generator's documentation for details
+
+    Returns:
+        The generated input string
+    """
+    module = importlib.import_module(f"benchmarks.generators.day_{day}")
+    return module.generate(scale, seed, **kwargs)
+
+def grid_size(base_size: int, scale: float) -> int:
+    """
+    Get the side length of a square grid, scaled so that its area grows linearly with the scale
+
+    Args:
+        base_size: The side length of the grid at a scale of 1
+        scale: The size of the input, relative to a real AOC input
+
+    Returns:
+        The scaled side length, which is always at least 1
+    """
+    return max(1, round(base_size * scale ** 0.5))
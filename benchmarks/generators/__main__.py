@@ -0,0 +1,13 @@
+"""Print a generated input, e.g. `python -m benchmarks.generators 6 --scale 4 > input.txt`"""
+import argparse
+import sys
+from benchmarks.generators import generate
+
+parser = argparse.ArgumentParser(description='Generate a synthetic input for an AoC day.')
+parser.add_argument("day", help="The day to generate an input for", type=int)
+parser.add_argument("--scale", help="The size of the input, relative to a real AOC input",
+                    type=float, default=1)
+parser.add_argument("--seed", help="The seed for the random number generator",
+                    type=int, default=0)
+args = parser.parse_args()
+sys.stdout.write(generate(args.day, args.scale, args.seed))
@@ -0,0 +1,22 @@
+"""Generator for Day 1 inputs: two columns of location IDs"""
+import random
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    """
+    Generate two columns of 5-digit location IDs, separated by three spaces. Values are drawn
+    from a range about the size of the row count, so that repeats (which matter for part 2)
+    are common.
+
+    Args:
+        scale: The size of the input, relative to a real AOC input (1000 rows)
+        seed: The seed for the random number generator
+
+    Returns:
+        The generated input string
+    """
+    rng = random.Random(seed)
+    rows = max(1, round(1000 * scale))
+    low = 10000
+    high = low + max(rows, 100)
+    lines = [f"{rng.randint(low, high)}   {rng.randint(low, high)}" for _ in range(rows)]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,32 @@
+"""Generator for Day 2 inputs: reports of levels"""
+import random
+
+def generate(scale: float = 1, seed: int = 0, min_levels: int = 5, max_levels: int = 8) -> str:
+    """
+    Generate reports of levels. Each report starts out safe (strictly ascending or descending,
+    in steps of 1 to 3), then has a chance of having one or two levels corrupted, so that the
+    input contains safe reports, reports made safe by the Problem Dampener, and unsafe reports.
+
+    Args:
+        scale: The size of the input, relative to a real AOC input (1000 reports)
+        seed: The seed for the random number generator
+        min_levels: The minimum number of levels in each report
+        max_levels: The maximum number of levels in each report
+
+    Returns:
+        The generated input string
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(max(1, round(1000 * scale))):
+        length = rng.randint(min_levels, max_levels)
+        direction = rng.choice([-1, 1])
+        level = rng.randint(40, 60)
+        report = []
+        for _ in range(length):
+            report.append(level)
+            level += direction * rng.randint(1, 3)
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            report[rng.randrange(length)] += rng.randint(-4, 4)
+        lines.append(" ".join(str(level) for level in report))
+    return "\n".join(lines) + "\n"
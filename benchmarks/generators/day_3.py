@@ -0,0 +1,54 @@
+"""Generator for Day 3 inputs: corrupted memory"""
+import random
+import string
+
+# Characters to fill the gaps between tokens with, including the ones used by the tokens
+# themselves, so that partial tokens show up too.
+NOISE = string.ascii_letters + string.digits + "!@#$%^&*()[]{}<>,'?+-_ "
+
+def generate(scale: float = 1, seed: int = 0, line_length: int = 3000) -> str:
+    """
+    Generate corrupted memory, as lines of noise scattered with valid and malformed
+    "mul(X,Y)" instructions, and "do()" and "don't()" instructions.
+
+    Args:
+        scale: The size of the input, relative to a real AOC input (6 lines of 3000 characters)
+        seed: The seed for the random number generator
+        line_length: The approximate length of each line
+
+    Returns:
+        The generated input string
+    """
+    rng = random.Random(seed)
+    tokens = [
+        lambda: f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})",
+        # Malformed instructions, which should be ignored
+        lambda: f"mul({rng.randint(1, 999)}, {rng.randint(1, 999)})",
+        lambda: f"mul[{rng.randint(1, 999)},{rng.randint(1, 999)}]",
+        lambda: f"mul({rng.randint(1000, 9999)},{rng.randint(1, 999)})",
+        lambda: f"mul({rng.randint(1, 999)},{rng.randint(1, 999)}",
+        lambda: "do()",
+        lambda: "don't()",
+        lambda: "do_not_mul(",
+    ]
+    weights = [10, 1, 1, 1, 1, 2, 2, 1]
+    total_length = max(1, round(6 * line_length * scale))
+    lines = []
+    line = []
+    line_size = 0
+    size = 0
+    while size < total_length:
+        if rng.random() < 0.5:
+            chunk = rng.choices(tokens, weights)[0]()
+        else:
+            chunk = "".join(rng.choices(NOISE, k=rng.randint(1, 8)))
+        line.append(chunk)
+        line_size += len(chunk)
+        size += len(chunk)
+        if line_size >= line_length:
+            lines.append("".join(line))
+            line = []
+            line_size = 0
+    if line:
+        lines.append("".join(line))
+    return "\n".join(lines) + "\n"
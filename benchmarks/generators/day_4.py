@@ -0,0 +1,33 @@
+"""Generator for Day 4 inputs: word searches"""
+import random
+from benchmarks.generators import grid_size
+
+def generate(scale: float = 1, seed: int = 0, height: int | None = None,
+             width: int | None = None) -> str:
+    """
+    Generate a word search, as a grid of the letters X, M, A and S. Some "XMAS" strings are
+    planted in random directions on top of the random letters, so that matches aren't too rare.
+
+    Args:
+        scale: The size of the input, relative to a real AOC input (140x140)
+        seed: The seed for the random number generator
+        height: The number of rows, overriding the scale
+        width: The number of columns, overriding the scale
+
+    Returns:
+        The generated input string
+    """
+    rng = random.Random(seed)
+    height = height or grid_size(140, scale)
+    width = width or grid_size(140, scale)
+    grid = [[rng.choice("XMAS") for _ in range(width)] for _ in range(height)]
+    directions = [(-1, 0), (0, 1), (1, 0), (0, -1), (-1, 1), (1, 1), (1, -1), (-1, -1)]
+    for _ in range(height * width // 50):
+        row_step, col_step = rng.choice(directions)
+        row, col = rng.randrange(height), rng.randrange(width)
+        end_row, end_col = row + 3 * row_step, col + 3 * col_step
+        if not (0 <= end_row < height and 0 <= end_col < width):
+            continue
+        for idx, char in enumerate("XMAS"):
+            grid[row + idx * row_step][col + idx * col_step] = char
+    return "\n".join("".join(row) for row in grid) + "\n"
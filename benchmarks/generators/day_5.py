@@ -0,0 +1,35 @@
+"""Generator for Day 5 inputs: page ordering rules and updates"""
+import random
+
+def generate(scale: float = 1, seed: int = 0, pages: int = 49, min_length: int = 5,
+             max_length: int = 23) -> str:
+    """
+    Generate page ordering rules and updates. The rules are generated from a random ordering of
+    the pages, with one rule for every pair of pages, so they always define a total order.
+    About half of the updates are already in order, and the rest are shuffled.
+
+    Args:
+        scale: The size of the input, relative to a real AOC input (200 updates)
+        seed: The seed for the random number generator
+        pages: The number of distinct page numbers, at most 90
+        min_length: The minimum number of pages in each update
+        max_length: The maximum number of pages in each update, at most the number of pages
+
+    Returns:
+        The generated input string
+    """
+    rng = random.Random(seed)
+    order = rng.sample(range(10, 100), pages)
+    rank = {page: idx for idx, page in enumerate(order)}
+    rules = [f"{order[i]}|{order[j]}" for i in range(pages) for j in range(i + 1, pages)]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(max(1, round(200 * scale))):
+        # Updates always have an odd length, so that they have a middle page
+        length = rng.randrange(min_length, max_length + 1, 2)
+        update = rng.sample(order, length)
+        if rng.random() < 0.5:
+            update.sort(key=rank.get)
+        updates.append(",".join(str(page) for page in update))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates) + "\n"
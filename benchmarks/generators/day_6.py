@@ -0,0 +1,67 @@
+"""Generator for Day 6 inputs: maps of a guard's patrol"""
+import random
+from benchmarks.generators import grid_size
+
+# Up, right, down and left, in the order the guard turns through them
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+def _leaves_map(height: int, width: int, walls: set[tuple[int, int]],
+                guard: tuple[int, int]) -> bool:
+    """
+    Check whether the guard leaves the map, or gets stuck in a loop
+
+    Args:
+        height: The number of rows
+        width: The number of columns
+        walls: The positions of the walls
+        guard: The guard's starting position. She always starts facing up.
+
+    Returns:
+        True if the guard leaves the map, False if she gets stuck in a loop
+    """
+    states = set()
+    pos, direction = guard, 0
+    while (pos, direction) not in states:
+        states.add((pos, direction))
+        step = DIRECTIONS[direction]
+        next_pos = (pos[0] + step[0], pos[1] + step[1])
+        if not (0 <= next_pos[0] < height and 0 <= next_pos[1] < width):
+            return True
+        if next_pos in walls:
+            direction = (direction + 1) % 4
+        else:
+            pos = next_pos
+    return False
+
+def generate(scale: float = 1, seed: int = 0, height: int | None = None,
+             width: int | None = None, density: float = 0.05) -> str:
+    """
+    Generate a map of obstructions ('#') and empty spaces ('.'), with a guard ('^') placed on an
+    empty space near the middle of the map. A real input never traps the guard in a loop, so
+    obstructions are removed at random until she leaves the map.
+
+    Args:
+        scale: The size of the input, relative to a real AOC input (130x130)
+        seed: The seed for the random number generator
+        height: The number of rows, overriding the scale
+        width: The number of columns, overriding the scale
+        density: The fraction of spaces which contain an obstruction
+
+    Returns:
+        The generated input string
+    """
+    rng = random.Random(seed)
+    height = height or grid_size(130, scale)
+    width = width or grid_size(130, scale)
+    walls = {(row, col) for row in range(height) for col in range(width)
+             if rng.random() < density}
+    guard = (rng.randrange(height // 4, height - height // 4),
+             rng.randrange(width // 4, width - width // 4))
+    walls.discard(guard)
+    while not _leaves_map(height, width, walls, guard):
+        walls.remove(rng.choice(sorted(walls)))
+
+    grid = [["#" if (row, col) in walls else "." for col in range(width)]
+            for row in range(height)]
+    grid[guard[0]][guard[1]] = "^"
+    return "\n".join("".join(row) for row in grid) + "\n"
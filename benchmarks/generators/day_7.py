@@ -0,0 +1,38 @@
+"""Generator for Day 7 inputs: calibration equations"""
+import random
+
+def generate(scale: float = 1, seed: int = 0, operands: int | None = None,
+             max_operand: int = 20) -> str:
+    """
+    Generate calibration equations. Each result is built by combining the operands with random
+    operators (+, * or ||), so most equations have a solution, and some results are then
+    nudged so that they don't.
+
+    Args:
+        scale: The size of the input, relative to a real AOC input (850 equations)
+        seed: The seed for the random number generator
+        operands: The number of operands in every equation. By default, each equation has
+        between 2 and 12 operands, like a real input.
+        max_operand: The largest value an operand can take
+
+    Returns:
+        The generated input string
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(max(1, round(850 * scale))):
+        count = operands or rng.randint(2, 12)
+        values = [rng.randint(1, max_operand) for _ in range(count)]
+        result = values[0]
+        for value in values[1:]:
+            operator = rng.choice("+*|")
+            if operator == "+":
+                result += value
+            elif operator == "*":
+                result *= value
+            else:
+                result = int(f"{result}{value}")
+        if rng.random() < 0.3:
+            result += rng.randint(1, 9)
+        lines.append(f"{result}: " + " ".join(str(value) for value in values))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,34 @@
+"""Generator for Day 8 inputs: maps of antennae"""
+import random
+import string
+from benchmarks.generators import grid_size
+
+FREQUENCIES = string.digits + string.ascii_letters
+
+def generate(scale: float = 1, seed: int = 0, height: int | None = None,
+             width: int | None = None, per_frequency: int = 4) -> str:
+    """
+    Generate a map of antennae, where each antenna is a digit or letter representing its
+    frequency, and empty spaces are '.'. The number of frequencies grows with the map, up to
+    the 62 available, and then the number of antennae per frequency grows instead.
+
+    Args:
+        scale: The size of the input, relative to a real AOC input (50x50)
+        seed: The seed for the random number generator
+        height: The number of rows, overriding the scale
+        width: The number of columns, overriding the scale
+        per_frequency: The number of antennae of each frequency, at a scale of 1
+
+    Returns:
+        The generated input string
+    """
+    rng = random.Random(seed)
+    height = height or grid_size(50, scale)
+    width = width or grid_size(50, scale)
+    # A real input has about one antenna per 12 spaces, spread over about 40 frequencies
+    antennae = max(1, height * width // 12)
+    frequencies = FREQUENCIES[:min(len(FREQUENCIES), max(1, antennae // per_frequency))]
+    grid = [["."] * width for _ in range(height)]
+    for position in rng.sample(range(height * width), min(antennae, height * width)):
+        grid[position // width][position % width] = rng.choice(frequencies)
+    return "\n".join("".join(row) for row in grid) + "\n"
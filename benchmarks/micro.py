@@ -0,0 +1,126 @@
+"""Microbenchmarks for the primitives in utils.grid"""
+from typing import Callable
+from utils.grid import Grid
+
+def _filled_grid(size: int, bounded: bool) -> Grid:
+    """
+    Create a square grid with every element set
+
+    Args:
+        size: The side length of the grid
+        bounded: True to give the grid bounds, False to leave it unbounded
+
+    Returns:
+        The grid
+    """
+    grid = Grid(".", (size, size) if bounded else None)
+    for row in range(size):
+        for col in range(size):
+            grid[(row, col)] = "#"
+    return grid
+
+def getitem(size: int) -> Callable[[], None]:
+    """
+    Benchmark reading every element of a bounded grid with __getitem__
+
+    Args:
+        size: The side length of the grid
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = _filled_grid(size, True)
+    positions = [(row, col) for row in range(size) for col in range(size)]
+    def run():
+        for position in positions:
+            grid[position] # pylint: disable=pointless-statement
+    return run
+
+def items(size: int) -> Callable[[], None]:
+    """
+    Benchmark iterating over every element of a bounded grid with items()
+
+    Args:
+        size: The side length of the grid
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = _filled_grid(size, True)
+    def run():
+        for _ in grid.items():
+            pass
+    return run
+
+def get_current_bounds(size: int) -> Callable[[], None]:
+    """
+    Benchmark finding the bounds of an unbounded grid with _get_current_bounds()
+
+    Args:
+        size: The side length of the grid
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = _filled_grid(size, False)
+    def run():
+        grid._get_current_bounds() # pylint: disable=protected-access
+    return run
+
+def render(size: int) -> Callable[[], None]:
+    """
+    Benchmark converting a bounded grid to a string with __str__
+
+    Args:
+        size: The side length of the grid
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = _filled_grid(size, True)
+    return lambda: str(grid)
+
+def neighbors(size: int) -> Callable[[], None]:
+    """
+    Benchmark finding the 4-neighbors of every element of a bounded grid with neighbors()
+
+    Args:
+        size: The side length of the grid
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = _filled_grid(size, True)
+    positions = [(row, col) for row in range(size) for col in range(size)]
+    def run():
+        for position in positions:
+            grid.neighbors(position)
+    return run
+
+def neighbor_table(size: int) -> Callable[[], None]:
+    """
+    Benchmark finding the 4-neighbors of every element of a bounded grid with a neighbor table
+
+    Args:
+        size: The side length of the grid
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    table = _filled_grid(size, True).neighbor_table()
+    # Tables aren't iterable (indexing past the end doesn't raise), so loop over the indexes
+    cells = table.height * table.width
+    def run():
+        for index in range(cells):
+            table[index] # pylint: disable=pointless-statement
+    return run
+
+# Map each microbenchmark's name to the function which sets it up
+BENCHMARKS: dict[str, Callable[[int], Callable[[], None]]] = {
+    "grid.__getitem__": getitem,
+    "grid.items": items,
+    "grid._get_current_bounds": get_current_bounds,
+    "grid.__str__": render,
+    "grid.neighbors": neighbors,
+    "grid.neighbor_table": neighbor_table,
+}
@@ -0,0 +1,152 @@
+"""Benchmarks for the searches in utils.grid_search, on generated mazes"""
+import random
+from functools import lru_cache
+from typing import Callable
+from utils import grid_search
+from utils.grid import Grid
+
+def _carve_maze(size: int, rng: random.Random, loop_fraction: float) -> list[bytearray]:
+    """
+    Carve the passages of a maze with a randomized depth-first search, then knock down some
+    extra walls to create loops.
+
+    Args:
+        size: The side length of the maze
+        rng: The random number generator to use
+        loop_fraction: The fraction of the remaining walls between cells to knock down
+
+    Returns:
+        The rows of the maze, with '1' for open cells and '#' for walls
+    """
+    # Cells are at odd coordinates in a grid of walls, with the outer ring left as walls
+    cells = (size - 1) // 2
+    rows = [bytearray(b"#" * size) for _ in range(size)]
+    visited = bytearray(cells * cells)
+    stack = [(0, 0)]
+    visited[0] = 1
+    rows[1][1] = ord("1")
+    while stack:
+        row, col = stack[-1]
+        unvisited = [(row + d_row, col + d_col)
+                     for d_row, d_col in ((-1, 0), (0, 1), (1, 0), (0, -1))
+                     if 0 <= row + d_row < cells and 0 <= col + d_col < cells
+                     and not visited[(row + d_row) * cells + col + d_col]]
+        if not unvisited:
+            stack.pop()
+            continue
+        next_row, next_col = rng.choice(unvisited)
+        visited[next_row * cells + next_col] = 1
+        rows[row + next_row + 1][col + next_col + 1] = ord("1")
+        rows[2 * next_row + 1][2 * next_col + 1] = ord("1")
+        stack.append((next_row, next_col))
+    # Knock down some walls between cells to create loops
+    for row in range(1, size - 1):
+        for col in range(1 + row % 2, size - 1, 2):
+            if rows[row][col] == ord("#") and rng.random() < loop_fraction:
+                rows[row][col] = ord("1")
+    return rows
+
+# Generating a large maze takes longer than searching it, so each one is only generated once
+@lru_cache(maxsize=4)
+def generate_maze(size: int, seed: int = 0, loop_fraction: float = 0.05,
+                  weighted_fraction: float = 0.1) -> Grid:
+    """
+    Generate a square maze with a randomized depth-first search, then knock down some extra
+    walls so that there's more than one route between most cells. Open cells are '1', except
+    for some which are given a random cost from '2' to '9', and walls are '#'.
+
+    Args:
+        size: The side length of the maze
+        seed: The seed for the random number generator
+        loop_fraction: The fraction of the remaining walls between cells to knock down
+        weighted_fraction: The fraction of open cells to give a random cost
+
+    Returns:
+        The maze. The cells in opposite corners are always open, see _corners().
+    """
+    rng = random.Random(seed)
+    rows = _carve_maze(size, rng, loop_fraction)
+    grid = Grid("1", (size, size))
+    for row_idx, row in enumerate(rows):
+        for col_idx, value in enumerate(row):
+            if value == ord("#"):
+                grid[(row_idx, col_idx)] = "#"
+            elif rng.random() < weighted_fraction:
+                grid[(row_idx, col_idx)] = str(rng.randint(2, 9))
+    return grid
+
+def _corners(size: int) -> tuple[tuple[int, int], tuple[int, int]]:
+    """
+    Get the open cells in the opposite corners of a maze from generate_maze()
+
+    Args:
+        size: The side length of the maze
+
+    Returns:
+        The top-left and bottom-right open cells
+    """
+    last = 2 * ((size - 1) // 2) - 1
+    return (1, 1), (last, last)
+
+def bfs(size: int) -> Callable[[], None]:
+    """
+    Benchmark a breadth-first search of a whole maze from one corner
+
+    Args:
+        size: The side length of the maze
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = generate_maze(size)
+    start, _ = _corners(size)
+    return lambda: grid_search.bfs(grid, [start])
+
+def dijkstra(size: int) -> Callable[[], None]:
+    """
+    Benchmark finding the cheapest path across a maze with weighted cells, with Dijkstra
+
+    Args:
+        size: The side length of the maze
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = generate_maze(size)
+    start, end = _corners(size)
+    return lambda: grid_search.dijkstra(grid, [start], cost=int, targets=[end])
+
+def a_star(size: int) -> Callable[[], None]:
+    """
+    Benchmark finding the cheapest path across a maze with weighted cells, with A*
+
+    Args:
+        size: The side length of the maze
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = generate_maze(size)
+    start, end = _corners(size)
+    return lambda: grid_search.a_star(grid, [start], end, cost=int)
+
+def flood_fill(size: int) -> Callable[[], None]:
+    """
+    Benchmark splitting a maze into connected regions
+
+    Args:
+        size: The side length of the maze
+
+    Returns:
+        A function which runs the benchmark once
+    """
+    grid = generate_maze(size)
+    return lambda: grid_search.flood_fill(grid)
+
+# Map each search benchmark's name to the function which sets it up
+BENCHMARKS: dict[str, Callable[[int], Callable[[], None]]] = {
+    "grid_search.bfs": bfs,
+    "grid_search.dijkstra": dijkstra,
+    "grid_search.a_star": a_star,
+    "grid_search.flood_fill": flood_fill,
+}
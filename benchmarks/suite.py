@@ -0,0 +1,152 @@
+"""
+A module for running the benchmark suite, and comparing its results against a baseline
+"""
+import contextlib
+import importlib
+import io
+import platform
+import statistics
+import time
+from typing import Callable
+from benchmarks import micro, search
+from benchmarks.generators import generate
+from utils import progress
+
+# The scales to generate each day's inputs at. Some solutions are much slower than others,
+# so their scales are smaller to keep the suite's runtime reasonable.
+DEFAULT_SCALES = (0.25, 1, 4)
+DAY_SCALES = {
+    6: (0.1, 0.25, 0.5),
+    7: (0.02, 0.05, 0.1),
+}
+# The side lengths of the grids for each microbenchmark
+MICRO_SIZES = (50, 100, 200)
+# The side lengths of the mazes for each search benchmark
+SEARCH_SIZES = (500, 1000, 2000)
+
+def time_runs(func: Callable, *args, repeats: int = 5) -> dict[str, float | list[float]]:
+    """
+    Time repeated calls to a function. Anything the function prints is discarded,
+    so that progress output doesn't affect the timings.
+
+    Args:
+        func: The function to time
+        *args: The arguments to call the function with
+        repeats: The number of times to call the function
+
+    Returns:
+        The timings, as a dict with the median, minimum and standard deviation of the runs,
+        and the list of runs, all in seconds
+    """
+    runs = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(*args)
+            runs.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(runs),
+        "min": min(runs),
+        "stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "runs": runs,
+    }
+
+def run_sized(benchmarks: dict[str, Callable[[int], Callable[[], None]]], sizes: tuple[int, ...],
+              repeats: int, log: Callable[[str], None]) -> dict:
+    """
+    Run each benchmark at each size.
+
+    Args:
+        benchmarks: Map of each benchmark's name to the function which sets it up for a size
+        sizes: The sizes to run each benchmark at
+        repeats: The number of times to run each benchmark
+        log: A function to report progress to
+
+    Returns:
+        The timings of each benchmark, keyed by name (e.g. "grid.items/size_100")
+    """
+    results = {}
+    for benchmark, setup in benchmarks.items():
+        for size in sizes:
+            name = f"{benchmark}/size_{size}"
+            results[name] = time_runs(setup(size), repeats=repeats)
+            log(f"{name}: {results[name]['median']:.6f}s")
+    return results
+
+def run_suite(days: list[int], repeats: int = 5, micro_benchmarks: bool = True,
+              log: Callable[[str], None] = print, search_benchmarks: bool = False) -> dict:
+    """
+    Run the parts of each day against generated inputs at several scales, plus the
+    microbenchmarks.
+
+    Args:
+        days: The days to benchmark
+        repeats: The number of times to run each benchmark
+        micro_benchmarks: True to run the microbenchmarks for utils.grid, False to skip them
+        log: A function to report progress to
+        search_benchmarks: True to run the utils.grid_search benchmarks on generated mazes,
+        which take a few minutes, False to skip them
+
+    Returns:
+        The results, as a dict with the details of the machine that ran the suite, and the
+        timings of each benchmark, keyed by name (e.g. "day_1/scale_1/part_1")
+    """
+    # Progress reports would only add noise to the timings
+    progress.enabled = False
+    results = {}
+    for day in days:
+        day_code = importlib.import_module(f"days.day_{day}").DayCode
+        for scale in DAY_SCALES.get(day, DEFAULT_SCALES):
+            in_str = generate(day, scale)
+            in_data = day_code.parse(in_str)
+            for part, func, arg in [("parse", day_code.parse, in_str),
+                                    ("part_1", day_code.part_1, in_data),
+                                    ("part_2", day_code.part_2, in_data)]:
+                name = f"day_{day}/scale_{scale}/{part}"
+                results[name] = time_runs(func, arg, repeats=repeats)
+                log(f"{name}: {results[name]['median']:.6f}s")
+    if micro_benchmarks:
+        results.update(run_sized(micro.BENCHMARKS, MICRO_SIZES, repeats, log))
+    if search_benchmarks:
+        results.update(run_sized(search.BENCHMARKS, SEARCH_SIZES, repeats, log))
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "repeats": repeats,
+        "results": results,
+    }
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1,
+            noise_factor: float = 3) -> list[str]:
+    """
+    Compare benchmark results against a baseline, and find any benchmarks that got slower.
+
+    A benchmark only counts as slower if its median is more than {threshold} slower than the
+    baseline median, *and* the difference is more than {noise_factor} times the larger of the
+    two standard deviations. The second check stops noisy benchmarks from being flagged when
+    they haven't really changed.
+
+    Args:
+        baseline: The baseline results, from run_suite()
+        current: The results to check, from run_suite()
+        threshold: The fraction by which a benchmark has to slow down to be flagged, e.g. 0.1
+        for 10%
+        noise_factor: How many standard deviations a slowdown has to exceed to be flagged
+
+    Returns:
+        A description of each benchmark that got slower
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        base = baseline["results"][name]
+        difference = result["median"] - base["median"]
+        noise = noise_factor * max(base["stdev"], result["stdev"])
+        if difference > base["median"] * threshold and difference > noise:
+            regressions.append(f"{name}: {base['median']:.6f}s -> {result['median']:.6f}s "
+                               f"({difference / base['median']:+.0%}, noise +/-{noise:.6f}s)")
+    return regressions
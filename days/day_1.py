@@ -1,30 +1,67 @@
 """Day 1 of Advent of Code 2024"""
+from collections import Counter
+from typing import Iterable
 from utils.abstract_day import Day
 
+# NumPy is optional. Without it, every input is solved with plain Python lists.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The largest location ID (in magnitude) that the NumPy engine handles. fromstring clamps IDs
+# which don't fit in an int64 instead of failing, so inputs with IDs this large or larger are
+# solved with plain Python ints instead. Below it, no difference between two IDs can overflow.
+MAX_ARRAY_ID = 2 ** 62
+# Sums whose estimate (in floating point) is below this are computed in int64, with plenty of
+# margin for the estimate's rounding. Larger sums are computed with Python ints.
+MAX_INT64_SUM = 2 ** 62
+
 class DayCode(Day):
     """
     Solutions to Day 1 of AOC, which you can find here: https://adventofcode.com/2024/day/1
     """
+    supports_streaming = True
+    # Days which read bytes are given the whole input file as a buffer, which the NumPy
+    # engine can parse without creating a Python object for each entry
+    supports_bytes = np is not None
+
     @classmethod
-    def parse_input(cls, in_str: str) -> tuple[list[int]]:
+    def parse_lines(cls, lines: Iterable[str]) -> tuple[list[int]]:
         """
-        Parse the given input into two lists
+        Parse the lines of the input into two lists
 
         Args:
-            in_str: The input string, as two columnar lists separated by three spaces.
+            lines: The lines of the input, each of which is two location IDs separated by
+            three spaces. Blank lines are skipped.
 
         Returns:
             The lists as a tuple of list objects
         """
         out_lists = ([], [])
-        for line in in_str.strip().split("\n"):
+        for line in lines:
+            if not line.strip():
+                continue
             entries = line.split("   ")
             for idx, out_list in enumerate(out_lists):
                 out_list.append(int(entries[idx]))
         return out_lists
 
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def parse(cls, in_str: str) -> tuple[list[int]]:
+        """
+        Parse the given input into two lists
+
+        Args:
+            in_str: The input string, as two columnar lists separated by three spaces.
+
+        Returns:
+            The lists as a tuple of list objects
+        """
+        return cls.parse_lines(in_str.strip().split("\n"))
+
+    @classmethod
+    def part_1(cls, in_data: tuple[list[int]]) -> str:
         """
         We're given two unordered lists of "location IDs" (two columns of input,
         where each is a list, split by three spaces), and we have to iteratively
@@ -36,12 +73,12 @@ class DayCode(Day):
         is simple, which I prefer over optimality.
 
         Args:
-            in_str: The input string from AOC
+            in_data: The two lists of location IDs, as returned by parse()
 
         Returns:
             The sum of differences between location IDs
         """
-        list_a, list_b = cls.parse_input(in_str)
+        list_a, list_b = in_data
         list_a = sorted(list_a)
         list_b = sorted(list_b)
         total = 0
@@ -50,7 +87,7 @@ class DayCode(Day):
         return str(total)
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: tuple[list[int]]) -> str:
         """
         The input is the same, but the problem changed. Now, we have to
         find the "similarity" between the two lists, which is defined as
@@ -63,12 +100,12 @@ class DayCode(Day):
         scores by checking said map.
 
         Args:
-            in_str: The input string from AOC
+            in_data: The two lists of location IDs, as returned by parse()
 
         Returns:
             The total similarity score
         """
-        list_a, list_b = cls.parse_input(in_str)
+        list_a, list_b = in_data
         freq_dict = {}
 
         for entry in list_b:
@@ -81,3 +118,167 @@ class DayCode(Day):
             similarity += entry * frequency
 
         return str(similarity)
+
+    @classmethod
+    def solve_both(cls, in_str: str) -> tuple[str, str]:
+        """
+        Solve both parts at once. See solve_lines() for details.
+
+        Args:
+            in_str: The input string, as two columnar lists separated by three spaces.
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        return cls.solve_lines(in_str.strip().split("\n"))
+
+    @classmethod
+    def solve_lines(cls, lines: Iterable[str]) -> tuple[str, str]:
+        """
+        Both parts work over the same lists, so we only need to parse them once. We can also
+        sort them in place, since nothing else shares them, and count list B's frequencies
+        with a Counter rather than building the frequency dict by hand. Parsing line by line
+        means that only the lists need to be kept in memory, not the input.
+
+        Args:
+            lines: The lines of the input, each of which is two location IDs separated by
+            three spaces.
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        list_a, list_b = cls.parse_lines(lines)
+        list_a.sort()
+        list_b.sort()
+        total = sum(abs(a - b) for a, b in zip(list_a, list_b))
+
+        freq_dict = Counter(list_b)
+        similarity = sum(entry * freq_dict[entry] for entry in list_a)
+        return str(total), str(similarity)
+
+    @classmethod
+    def parse_arrays(cls, buffer: bytes) -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Parse the input straight into two NumPy arrays, without creating a Python int (or
+        string) for each entry. Requires NumPy. fromstring only accepts bytes, so a buffer
+        such as a memory-mapped file is copied into memory once first.
+
+        Args:
+            buffer: The input from AoC, as a bytes-like object
+
+        Returns:
+            The two lists, as int64 arrays
+
+        Raises:
+            ValueError: If the input isn't made of whitespace-separated integers, or one of
+            its lines doesn't have two of them
+            OverflowError: If any location ID is too large to parse into an int64 safely,
+            see MAX_ARRAY_ID
+        """
+        data = bytes(buffer)
+        # fromstring reads an input that's only whitespace as a single 0
+        if not data or data.isspace():
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        # With a separator, fromstring parses text in C, treating any whitespace as a separator
+        values = np.fromstring(data, dtype=np.int64, sep=" ")
+        if len(values) % 2:
+            raise ValueError("Every line of the input must have two location IDs")
+        if len(values) and max(values.max(), -values.min()) >= MAX_ARRAY_ID:
+            raise OverflowError("Location IDs are too large for the NumPy engine")
+        return values[0::2], values[1::2]
+
+    @classmethod
+    def count_runs(cls, values: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Find the unique values in a sorted array, and how many times each appears. This is the
+        same as np.unique(values, return_counts=True), but it doesn't sort the array again.
+
+        Args:
+            values: The array, which must be sorted
+
+        Returns:
+            A tuple (Values, Counts) of the unique values in order, and the count of each
+        """
+        starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+        return values[starts], np.diff(np.append(starts, len(values)))
+
+    @classmethod
+    def exact_product_sum(cls, *factors: "np.ndarray") -> int:
+        """
+        Multiply some int64 arrays together element-wise, and sum the products, without
+        overflowing. The sum is estimated in floating point first, and if it's small enough,
+        it's computed in int64. Otherwise, it's computed with Python ints, which is much
+        slower, but exact however large the sum is.
+
+        Args:
+            *factors: The arrays to multiply, which must all be the same length
+
+        Returns:
+            The sum of the products
+        """
+        estimate = factors[0].astype(np.float64)
+        for factor in factors[1:]:
+            estimate *= factor
+        if np.abs(estimate).sum() < MAX_INT64_SUM:
+            products = factors[0].copy()
+            for factor in factors[1:]:
+                products *= factor
+            return int(products.sum())
+        products = factors[0].astype(object)
+        for factor in factors[1:]:
+            products *= factor.astype(object)
+        return int(products.sum())
+
+    @classmethod
+    def solve_arrays(cls, list_a: "np.ndarray", list_b: "np.ndarray") -> tuple[str, str]:
+        """
+        The same approach as solve_lines(), but vectorized with NumPy, so no Python code
+        runs per entry. Part 1 is just a sort and a sum of differences. For part 2, instead of
+        a frequency dict, we take each list's unique values and their counts, and binary
+        search list B's values for each of list A's. Values which aren't in list B land on a
+        different value, and count for nothing.
+        The sums can be far larger than the IDs (e.g. an ID which appears in every line of
+        both lists is multiplied by the square of the line count), so they're computed with
+        exact_product_sum(), which falls back to Python ints if they could overflow an int64.
+
+        Args:
+            list_a: The first list, as an int64 array. It's sorted in place.
+            list_b: The second list, as an int64 array. It's sorted in place.
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        list_a.sort()
+        list_b.sort()
+        total = cls.exact_product_sum(np.abs(list_a - list_b))
+        if len(list_a) == 0:
+            return str(total), "0"
+
+        values_a, counts_a = cls.count_runs(list_a)
+        values_b, counts_b = cls.count_runs(list_b)
+        # searchsorted gives the index each value would be inserted at, which is only the
+        # value's own index in values_b if it's there. Past the end, clip to the last value.
+        indexes = np.minimum(np.searchsorted(values_b, values_a), len(values_b) - 1)
+        found = values_b[indexes] == values_a
+        similarity = cls.exact_product_sum(values_a[found], counts_a[found],
+                                           counts_b[indexes[found]])
+        return str(total), str(similarity)
+
+    @classmethod
+    def solve_bytes(cls, buffer: bytes) -> tuple[str, str]:
+        """
+        Solve both parts with NumPy. See solve_arrays() for details. This is only used when
+        NumPy is installed, see supports_bytes. Inputs with location IDs too large for NumPy
+        are solved with plain Python instead.
+
+        Args:
+            buffer: The input from AoC, as a bytes-like object
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        try:
+            lists = cls.parse_arrays(buffer)
+        except OverflowError:
+            return cls.solve_both(bytes(buffer).decode())
+        return cls.solve_arrays(*lists)
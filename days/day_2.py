@@ -1,13 +1,16 @@
 """Day 2 of Advent of Code 2024"""
 import math
+from typing import Iterable
 from utils.abstract_day import Day
 
 class DayCode(Day):
     """
     Solutions to Day 2 of AOC, which you can find here: https://adventofcode.com/2024/day/2
     """
+    supports_streaming = True
+
     @classmethod
-    def parse_input(cls, in_str: str) -> list[list[int]]:
+    def parse(cls, in_str: str) -> list[list[int]]:
         """
         Parse the input for this problem
 
@@ -19,14 +22,27 @@ class DayCode(Day):
         """
         out_list = []
         for line in in_str.splitlines():
-            report = []
-            for digit in line.split(" "):
-                report.append(int(digit))
-            out_list.append(report)
+            out_list.append(cls.parse_report(line))
         return out_list
 
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def parse_report(cls, line: str) -> list[int]:
+        """
+        Parse a single line of the input
+
+        Args:
+            line: The line, as a list of integers separated by spaces
+
+        Returns:
+            The report, as a list of integers
+        """
+        report = []
+        for digit in line.split():
+            report.append(int(digit))
+        return report
+
+    @classmethod
+    def part_1(cls, in_data: list[list[int]]) -> str:
         """
         The input data is a collection of lines ("Reports") of integers ("Levels")
         coming from a reactor. A report is deemed safe if the levels meet both of the
@@ -44,14 +60,13 @@ class DayCode(Day):
         out of the loop early to save a few iterations.
 
         Args:
-            in_str: The input string from AoC
+            in_data: The list of reports, as returned by parse()
 
         Returns:
             The count of safe reports in the input
         """
-        reports = cls.parse_input(in_str)
         count = 0
-        for report in reports:
+        for report in in_data:
             is_safe = True
             travel_direction = 0
             # Assumption: Each report has at least 1 level
@@ -104,7 +119,7 @@ class DayCode(Day):
         return True
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: list[list[int]]) -> str:
         """
         The problem is the same as part 1, except that we can now use the Problem Dampener.
         This means that, if any one level could be removed and cause the report to be Safe,
@@ -124,22 +139,74 @@ class DayCode(Day):
         at the cost of a ~2x speed penalty on this input, which is about 1ms.
 
         Args:
-            in_str: The input string from AoC
+            in_data: The list of reports, as returned by parse()
 
         Returns:
             The number of safe reports in the set
         """
-        reports = cls.parse_input(in_str)
         count = 0
-        for report in reports:
-            variations = [report]
-            for idx, _ in enumerate(report):
-                variation = report.copy()
-                variation.pop(idx)
-                variations.append(variation)
-
-            for variation in variations:
-                if cls.check_report_safety(variation):
-                    count += 1
-                    break
+        for report in in_data:
+            if cls.check_dampened_report_safety(report):
+                count += 1
         return count
+
+    @classmethod
+    def check_dampened_report_safety(cls, report: list[int]) -> bool:
+        """
+        Check if a report is safe or not, with the Problem Dampener
+
+        Args:
+            report: The report to check
+
+        Returns:
+            True if safe, False if not
+        """
+        variations = [report]
+        for idx, _ in enumerate(report):
+            variation = report.copy()
+            variation.pop(idx)
+            variations.append(variation)
+
+        for variation in variations:
+            if cls.check_report_safety(variation):
+                return True
+        return False
+
+    @classmethod
+    def solve_both(cls, in_str: str) -> tuple[str, str]:
+        """
+        Solve both parts at once. See solve_lines() for details.
+
+        Args:
+            in_str: The input string from AoC
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        return cls.solve_lines(in_str.splitlines())
+
+    @classmethod
+    def solve_lines(cls, lines: Iterable[str]) -> tuple[str, str]:
+        """
+        Each report is checked independently, so we can check them one at a time as we read
+        them, without keeping the rest of the input around. Any report that's safe without the
+        Problem Dampener is also safe with it, so we only need the slower check for the rest.
+
+        Args:
+            lines: The lines of the input, each of which is a report
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        safe_count = 0
+        dampened_count = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            report = cls.parse_report(line)
+            if cls.check_report_safety(report):
+                safe_count += 1
+                dampened_count += 1
+            elif cls.check_dampened_report_safety(report):
+                dampened_count += 1
+        return str(safe_count), str(dampened_count)
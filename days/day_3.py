@@ -1,14 +1,23 @@
 """Day 3 of Advent of Code 2024"""
 import re
+from itertools import chain
+from utils import parallel
 from utils.abstract_day import Day
 
+# Match any "mul(X,Y)", "do()" or "don't()" op. mul() ops capture both digits.
+OP_PATTERN = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+# The longest op is "mul(XXX,YYY)", so an op starting at the end of a chunk could run this many
+# bytes past it
+MAX_OP_OVERHANG = len("mul(123,456)") - 1
+
 class DayCode(Day):
     """
     Solutions to Day 3 of AOC, which you can find here: https://adventofcode.com/2024/day/3
     """
+    supports_bytes = True
 
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def part_1(cls, in_data: str) -> str:
         """
         The input is representative of the memory of a computer, which is corruputed.
         The goal of the corrupted program is to multiply some numbers, but many of
@@ -26,7 +35,7 @@ class DayCode(Day):
         us the digits, which we just multiply and sum to get the answer.
 
         Args:
-            in_str: The input string to process.
+            in_data: The input string to process.
 
         Returns:
             The number of valid mul operations in the input.
@@ -34,12 +43,12 @@ class DayCode(Day):
         # Match anything of the format "mul(X,Y)", where X and Y are 1-3 digit numbers.
         pattern = re.compile(r'mul\((\d{1,3}),(\d{1,3})\)')
         total = 0
-        for op in pattern.finditer(in_str):
+        for op in pattern.finditer(in_data):
             total += int(op[1]) * int(op[2])
         return total
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: str) -> str:
         """
         The twist today is easier than expected, it just asks us to check for
         "do()" and "don't()" operations. These respectively enable and disable the
@@ -53,7 +62,7 @@ class DayCode(Day):
         should run, as before.
 
         Args:
-            in_str: The input string from AoC
+            in_data: The input string from AoC
 
         Returns:
             The sum of the products, adhering to do() and don't() ops
@@ -67,7 +76,88 @@ class DayCode(Day):
         # Captures the contained substring as the only capture group.
         do_pattern = re.compile(r"(?:(?:do\(\))|^)(.*?)(?:(?:don't\(\))|$)", re.S)
         total = 0
-        for code in do_pattern.finditer(in_str):
+        for code in do_pattern.finditer(in_data):
             for op in mul_pattern.finditer(code[1]):
                 total += int(op[1]) * int(op[2])
         return total
+
+    @classmethod
+    def summarize_chunk(cls, chunk: bytes, end: int) -> tuple[int, int, int, bool | None]:
+        """
+        Sum the mul() ops in a chunk of the input, for both parts. Part 2 depends on whether
+        the ops before the chunk left us enabled, so we need the chunk's sum both ways. Those
+        only differ until the chunk's first do() or don't() op, and if the chunk starts
+        disabled, nothing before that op counts, so one pass (assuming we start enabled) is
+        enough to work out both.
+
+        No op can start inside another one, so the chunk can start scanning from its first
+        byte, even if that's in the middle of an op which belongs to the chunk before it, and
+        the ops which straddle the end of the chunk can be found with a second short scan.
+
+        Args:
+            chunk: The chunk of the input, followed by enough of the input after it to finish
+            any op which starts in the chunk
+            end: The length of the chunk itself. Ops starting here or later belong to the
+            next chunk.
+
+        Returns:
+            A tuple (Total, Enabled, Disabled, Exit)
+                Total - The sum of every mul() op, for part 1
+                Enabled - The sum of the enabled mul() ops, if the chunk starts enabled
+                Disabled - The sum of the enabled mul() ops, if the chunk starts disabled
+                Exit - Whether the last do() or don't() op enabled the ops after it, or None
+                if there wasn't one
+        """
+        total = 0
+        enabled_total = 0
+        # The sum of the mul() ops before the first do() or don't() op
+        head_total = None
+        enabled = True
+        ops = OP_PATTERN.finditer(chunk, 0, end)
+        straddling = OP_PATTERN.finditer(chunk, max(end - MAX_OP_OVERHANG, 0))
+        ops = chain(ops, (op for op in straddling if op.start() < end < op.end()))
+        for op in ops:
+            if op[1] is not None:
+                product = int(op[1]) * int(op[2])
+                total += product
+                if enabled:
+                    enabled_total += product
+            else:
+                if head_total is None:
+                    head_total = enabled_total
+                enabled = op[0] == b"do()"
+        if head_total is None:
+            return total, enabled_total, 0, None
+        return total, enabled_total, enabled_total - head_total, enabled
+
+    @classmethod
+    def solve_bytes(cls, buffer: bytes) -> tuple[str, str]:
+        """
+        Both parts look for the same mul() ops, so we can find them all in a single pass,
+        along with any do() and don't() ops, and keep track of whether we're enabled as we go.
+        Every mul() op counts for part 1, but only the enabled ones count for part 2.
+        The regex runs on the raw bytes, so the input never needs to be decoded or copied.
+
+        Whether an op is enabled depends on every op before it, so large inputs can't just be
+        split up and summed like the other days. Instead, each chunk is summarized with its
+        sum if it starts enabled, its sum if it starts disabled, and whether it leaves us
+        enabled (see summarize_chunk()). The chunks are summarized in parallel, and then the
+        summaries are combined from left to right, picking each chunk's sum based on the state
+        the chunks before it left us in.
+
+        Args:
+            buffer: The input from AoC, as a bytes-like object
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        total = 0
+        enabled_total = 0
+        enabled = True
+        for summary in parallel.map_chunks(buffer, cls.summarize_chunk, MAX_OP_OVERHANG):
+            chunk_total, chunk_enabled, chunk_disabled, exit_state = summary
+            total += chunk_total
+            enabled_total += chunk_enabled if enabled else chunk_disabled
+            if exit_state is not None:
+                enabled = exit_state
+        return str(total), str(enabled_total)
@@ -1,14 +1,17 @@
 """Day 4 of Advent of Code 2024"""
 from enum import Enum
+from utils import stats
 from utils.abstract_day import Day
+from utils.grid import get_buffer_shape
 
 class DayCode(Day):
     """
     Solutions to Day 4 of AOC, which you can find here: https://adventofcode.com/2024/day/4
     """
+    supports_bytes = True
 
     @classmethod
-    def parse_input(cls, in_str: str) -> list[list[str]]:
+    def parse(cls, in_str: str) -> list[list[str]]:
         """
         Parse the input into a 2D list of strings
 
@@ -57,8 +60,10 @@ class DayCode(Day):
         search_str = "XMAS"
         # The first character is shared by all directions
         if in_list[row][col] != search_str[0]:
+            stats.count("cells_probed")
             return []
 
+        probes = 1
         xmas_instances = []
         for direction in cls.Direction:
             search_row, search_col = row, col
@@ -70,6 +75,7 @@ class DayCode(Day):
                         search_col < 0 or search_col >= len(in_list[search_row]):
                     break
                 next_char = in_list[search_row][search_col]
+                probes += 1
                 # If the character is wrong, stop checking this direction
                 if next_char != search_char:
                     break
@@ -77,11 +83,12 @@ class DayCode(Day):
             else:
                 # If all search characters matched, this is a valid XMAS.
                 xmas_instances.append([row, col, direction])
+        stats.count("cells_probed", probes)
         return xmas_instances
 
 
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def part_1(cls, in_data: list[list[str]]) -> str:
         """
         Today's problem is a word search. We're looking for all instances of the string "XMAS" in
         a large block of text, but it can occur in any of the 8 cardinal directions and diagonals.
@@ -94,16 +101,16 @@ class DayCode(Day):
         the input and find the count of these instances to get the number of XMASes.
 
         Args:
-            in_str: A block of text containing an unknown number of "XMAS" strings
+            in_data: A block of text containing an unknown number of "XMAS" strings, as returned
+            by parse()
 
         Returns:
             The count of XMAS strings in the text
         """
-        grid = cls.parse_input(in_str)
         total = 0
-        for row_idx, row_val in enumerate(grid):
+        for row_idx, row_val in enumerate(in_data):
             for col_idx, _ in enumerate(row_val):
-                total += len(cls.find_xmases_from_here(grid, row_idx, col_idx))
+                total += len(cls.find_xmases_from_here(in_data, row_idx, col_idx))
         return str(total)
 
     @classmethod
@@ -119,6 +126,7 @@ class DayCode(Day):
         Returns:
             True if this position is the center of an X-MAS, False otherwise
         """
+        stats.count("cells_probed")
         # If the center character isn't "A", we can skip checking it.
         if in_list[row][col] != "A":
             return False
@@ -131,6 +139,7 @@ class DayCode(Day):
                           (cls.Direction.UP_RIGHT, cls.Direction.DOWN_LEFT)]:
             top_leg = in_list[row + cross_dir[0].value[0]][col + cross_dir[0].value[1]]
             bot_leg = in_list[row + cross_dir[1].value[0]][col + cross_dir[1].value[1]]
+            stats.count("cells_probed", 2)
             if top_leg not in ["M", "S"] or bot_leg not in ["M", "S"]:
                 return False
             if bot_leg == top_leg:
@@ -138,7 +147,7 @@ class DayCode(Day):
         return True
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: list[list[str]]) -> str:
         """
         Part 2 is totally different from what I expected. It's asking for X-MASes, which are
         two "MAS" strings in an X configuration, e.g.:
@@ -160,15 +169,96 @@ class DayCode(Day):
 
 
         Args:
-            in_str: A block of text containing an unknown number of "MAS"es in the shape
-            of an X.
+            in_data: A block of text containing an unknown number of "MAS"es in the shape
+            of an X, as returned by parse()
 
         Returns:
             The number of X-MASes
         """
-        grid = cls.parse_input(in_str)
         total = 0
-        for row_idx, row_val in enumerate(grid):
+        for row_idx, row_val in enumerate(in_data):
             for col_idx, _ in enumerate(row_val):
-                total += cls.check_x_mas(grid, row_idx, col_idx)
+                total += cls.check_x_mas(in_data, row_idx, col_idx)
         return str(total)
+
+    @classmethod
+    def count_xmases_in_bytes(cls, buffer: bytes, height: int, width: int, stride: int) -> int:
+        """
+        Count every XMAS in the raw bytes of the input, the same way as find_xmases_from_here().
+
+        Args:
+            buffer: The input from AoC, as a bytes-like object
+            height: The number of rows in the input
+            width: The number of characters in each row, not counting the line ending
+            stride: The number of bytes from the start of one row to the start of the next
+
+        Returns:
+            The number of XMASes
+        """
+        xmas_count = 0
+        # Searching for the first character is done in C, which is much faster than checking
+        # every position one by one.
+        pos = buffer.find(b"X")
+        while pos != -1:
+            row, col = divmod(pos, stride)
+            for direction in cls.Direction:
+                d_row, d_col = direction.value
+                # If the last character would be out of bounds, skip this direction.
+                if not (0 <= row + 3 * d_row < height and 0 <= col + 3 * d_col < width):
+                    continue
+                step = d_row * stride + d_col
+                for idx, search_byte in enumerate(b"MAS", 1):
+                    if buffer[pos + idx * step] != search_byte:
+                        break
+                else:
+                    xmas_count += 1
+            pos = buffer.find(b"X", pos + 1)
+        return xmas_count
+
+    @classmethod
+    def count_x_mases_in_bytes(cls, buffer: bytes, height: int, width: int, stride: int) -> int:
+        """
+        Count every X-MAS in the raw bytes of the input, the same way as check_x_mas().
+
+        Args:
+            buffer: The input from AoC, as a bytes-like object
+            height: The number of rows in the input
+            width: The number of characters in each row, not counting the line ending
+            stride: The number of bytes from the start of one row to the start of the next
+
+        Returns:
+            The number of X-MASes
+        """
+        x_mas_count = 0
+        legs = {ord("M"), ord("S")}
+        diagonals = [(-stride - 1, stride + 1), (-stride + 1, stride - 1)]
+        pos = buffer.find(b"A")
+        while pos != -1:
+            row, col = divmod(pos, stride)
+            if 1 <= row < height - 1 and 1 <= col < width - 1:
+                for top_step, bot_step in diagonals:
+                    top_leg = buffer[pos + top_step]
+                    bot_leg = buffer[pos + bot_step]
+                    if top_leg not in legs or bot_leg not in legs or top_leg == bot_leg:
+                        break
+                else:
+                    x_mas_count += 1
+            pos = buffer.find(b"A", pos + 1)
+        return x_mas_count
+
+    @classmethod
+    def solve_bytes(cls, buffer: bytes) -> tuple[str, str]:
+        """
+        Solve both parts directly on the raw bytes of the input, without building a 2D list.
+        Each row is {width} characters followed by a newline, so the position (row, col) is at
+        offset row * (width + 1) + col, and moving in a direction is just adding a fixed offset.
+
+        Args:
+            buffer: The input from AoC, as a bytes-like object
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        shape = get_buffer_shape(buffer)
+        return (str(cls.count_xmases_in_bytes(buffer, *shape)),
+                str(cls.count_x_mases_in_bytes(buffer, *shape)))
@@ -1,14 +1,17 @@
 """Day 5 of Advent of Code 2024"""
 from functools import cmp_to_key
+from typing import Iterable
+from utils import cache, stats
 from utils.abstract_day import Day
 
 class DayCode(Day):
     """
     Solutions to Day 5 of AOC, which you can find here: https://adventofcode.com/2024/day/5
     """
+    supports_streaming = True
 
     @classmethod
-    def parse_input(cls, in_str: str) -> tuple[dict[int, set[int]], list[list[int]]]:
+    def parse(cls, in_str: str) -> tuple[dict[int, set[int]], list[list[int]]]:
         """
         Parse the input string from AoC, which is a list of sorting rules followed by
         the data to process.
@@ -26,30 +29,63 @@ class DayCode(Day):
                 Rules - A dictionary mapping each A character to all of its B characters.  
                 Data - A list of all input lists of digits.
         """
-        rules = {}
         data = []
         rules_str, data_str = in_str.split("\n\n")
+        rules = cls.parse_rules(rules_str.splitlines())
+
+        for entry in data_str.splitlines():
+            data.append(cls.parse_update(entry))
+        return rules, data
+
+    @classmethod
+    def parse_rules(cls, lines: Iterable[str]) -> dict[int, set[int]]:
+        """
+        Parse the sorting rules from the input, stopping at the first blank line.
+        Any lines after that are left in the iterator, so the updates can be read from it next.
+
+        Args:
+            lines: The lines of the input, starting with the rules. Each rule is a pair of
+            integers (A,B), separated with a '|' character.
 
-        for rule_str in rules_str.splitlines():
+        Returns:
+            A dictionary mapping each A character to all of its B characters.
+        """
+        rules = {}
+        for rule_str in lines:
+            if not rule_str.strip():
+                break
             a, b = rule_str.split("|")
             successors = rules.setdefault(int(a), set())
             successors.add(int(b))
+        return rules
 
-        for entry in data_str.splitlines():
-            data.append([int(page) for page in entry.split(",")])
-        return rules, data
+    @classmethod
+    def parse_update(cls, line: str) -> list[int]:
+        """
+        Parse a single update from the input
+
+        Args:
+            line: The update, as a list of integers separated by ',' characters
+
+        Returns:
+            The update, as a list of integers
+        """
+        return [int(page) for page in line.split(",")]
 
     @classmethod
+    # The rules are never changed after parsing, so they can be keyed by identity
+    @cache.memoize(key=lambda cls, rules, update: (id(rules), tuple(update)))
     def make_update_valid(cls, rules: dict[int, set[int]], update: list[int]) -> list[int]:
         """
-        For a given update, sort it so that it becomes valid
+        For a given update, sort it so that it becomes valid. Both parts sort every update,
+        so the sorted updates are cached, and part 2 reuses the ones part 1 sorted.
 
         Args:
             rules: The set of rules from the input
             update: The list of pages to re-sort
 
         Returns:
-            The sorted update
+            The sorted update, which is shared with the cache and shouldn't be modified
         """
         def compare_pages(x, y):
             if x in rules and y in rules[x]:
@@ -57,10 +93,12 @@ class DayCode(Day):
             if y in rules and x in rules[y]:
                 return 1
             return 0
+        if stats.enabled:
+            compare_pages = stats.counted("comparisons", compare_pages)
         return sorted(update, key=cmp_to_key(compare_pages))
 
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def part_1(cls, in_data: tuple[dict[int, set[int]], list[list[int]]]) -> str:
         """
         Today's challenge is to use a custom set of sorting rules to verify that a given
         set of input numbers (a list of "updates", where each int is a "page number")
@@ -82,14 +120,13 @@ class DayCode(Day):
         there's a pretty good chance that they would compile to the same result anyways.
 
         Args:
-            in_str: The input string, which is a list of sorting rules followed by the
-            data to process.
+            in_data: The sorting rules and the data to process, as returned by parse()
 
         Returns:
             The total of all middle values of the lists which are already sorted
         """
         middle_sum = 0
-        rules, data = cls.parse_input(in_str)
+        rules, data = in_data
         for entry in data:
             if entry != cls.make_update_valid(rules, entry):
                 continue
@@ -97,7 +134,7 @@ class DayCode(Day):
         return middle_sum
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: tuple[dict[int, set[int]], list[list[int]]]) -> str:
         """
         As expected, part 2 is to sort the updates according to the provided rules. The instructions
         are to sum the middles values of only the updates which were invalid before, but only after
@@ -116,16 +153,59 @@ class DayCode(Day):
         to think of a way to define this relationship as a key without overcomplicating it.
 
         Args:
-            in_str: The input string, which is a list of sorting rules followed by the
-            data to process.
+            in_data: The sorting rules and the data to process, as returned by parse()
 
         Returns:
             The total of all of the middle values of the previously invalid entries, after sorting.
         """
         middle_sum = 0
-        rules, data = cls.parse_input(in_str)
+        rules, data = in_data
         for entry in data:
             sorted_entry = cls.make_update_valid(rules, entry)
             if entry != sorted_entry:
                 middle_sum += sorted_entry[len(entry) // 2]
         return middle_sum
+
+    @classmethod
+    def solve_both(cls, in_str: str) -> tuple[str, str]:
+        """
+        Solve both parts at once. See solve_lines() for details.
+
+        Args:
+            in_str: The input string, which is a list of sorting rules followed by the
+            data to process.
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        return cls.solve_lines(in_str.splitlines())
+
+    @classmethod
+    def solve_lines(cls, lines: Iterable[str]) -> tuple[str, str]:
+        """
+        Both parts sort every update and then compare it to the original, so we can sort each
+        update once and hand it to whichever part it belongs to. An update which is already
+        sorted counts towards part 1, and any other update counts towards part 2.
+        Only the rules need to be kept in memory, since each update is handled as it's read.
+
+        Args:
+            lines: The lines of the input, which is a list of sorting rules followed by a
+            blank line and the data to process.
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        valid_sum = 0
+        fixed_sum = 0
+        lines = iter(lines)
+        rules = cls.parse_rules(lines)
+        for line in lines:
+            if not line.strip():
+                continue
+            entry = cls.parse_update(line)
+            sorted_entry = cls.make_update_valid(rules, entry)
+            if entry == sorted_entry:
+                valid_sum += entry[len(entry) // 2]
+            else:
+                fixed_sum += sorted_entry[len(entry) // 2]
+        return str(valid_sum), str(fixed_sum)
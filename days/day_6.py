@@ -1,6 +1,10 @@
 """Day 6 of Advent of Code 2024"""
+import re
 from enum import Enum
+from typing import Callable
+from utils import cycles, progress, stats, tracing
 from utils.abstract_day import Day
+from utils.grid import Grid
 
 class DayCode(Day):
     """
@@ -18,8 +22,149 @@ class DayCode(Day):
 
         TURN_RIGHT = {UP: RIGHT, RIGHT: DOWN, DOWN: LEFT, LEFT: UP}
 
+    # The directions in clockwise order, so turning right is moving to the next one
+    CLOCKWISE = (Direction.UP.value, Direction.RIGHT.value, Direction.DOWN.value,
+                 Direction.LEFT.value)
+    # The number of obstructions to try in each batch in solve_both()
+    CANDIDATE_BATCH_SIZE = 256
+
+    @classmethod
+    def parse(cls, in_str: str) -> tuple[Grid, tuple[int, int]]:
+        """
+        Load the map once, so that both parts can share it. See find_guard().
+
+        Args:
+            in_str: The input string, representing a map.
+
+        Returns:
+            A tuple (Grid, Position), as returned by find_guard()
+        """
+        return cls.find_guard(in_str)
+
+    @classmethod
+    def find_guard(cls, in_str: str) -> tuple[Grid, tuple[int, int]]:
+        """
+        Load the map into a grid and find the guard's starting position
+
+        Args:
+            in_str: The input string, representing a map.
+
+        Returns:
+            A tuple (Grid, Position)
+                Grid - The map, where only the non-empty spaces are stored
+                Position - The guard's starting position, as (row, col)
+        """
+        # Assumption: The grid is always rectangular
+        width = in_str.find("\n")
+        if width == -1:
+            width = len(in_str)
+        height = len(in_str.splitlines())
+        grid = Grid('.', (height, width))
+        # Find the non-empty spaces in one pass over the whole map, rather than row by row
+        for match in re.finditer(r"[^.\n]", in_str):
+            grid[divmod(match.start(), width + 1)] = match.group()
+        guard_pos = divmod(in_str.find("^"), width + 1)
+        return grid, guard_pos
+
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def guard_step(cls, grid: Grid) -> Callable[[int], int | None]:
+        """
+        Make the function that moves the guard one step, for use with utils.cycles.
+        The guard's state is packed into a single int, (row * width + col) * 4 + direction,
+        where the direction is an index into CLOCKWISE. Keeping the state as one small int
+        makes it cheap to compare and remember.
+
+        Args:
+            grid: The map, as returned by find_guard() (or an overlay of it)
+
+        Returns:
+            A function which takes the guard's state and returns her next state, or None if
+            she leaves the map. She either moves forward, or turns right if there's a wall.
+        """
+        top, left, bottom, right = grid.bounds
+        width = right - left
+        clockwise = cls.CLOCKWISE
+        def step(state: int) -> int | None:
+            index, direction = divmod(state, 4)
+            row, col = divmod(index, width)
+            d_row, d_col = clockwise[direction]
+            next_pos = (row + d_row + top, col + d_col + left)
+            if not (top <= next_pos[0] < bottom and left <= next_pos[1] < right):
+                return None
+            if grid[next_pos] == '#':
+                return index * 4 + (direction + 1) % 4
+            return (index + d_row * width + d_col) * 4 + direction
+        return step
+
+    @classmethod
+    def guard_state(cls, grid: Grid, guard_pos: tuple[int, int]) -> int:
+        """
+        Get the guard's starting state, facing up, for use with guard_step()
+
+        Args:
+            grid: The map, as returned by find_guard()
+            guard_pos: The guard's starting position, as (row, col)
+
+        Returns:
+            The guard's state
+        """
+        top, left, _, right = grid.bounds
+        return ((guard_pos[0] - top) * (right - left) + guard_pos[1] - left) * 4
+
+    @classmethod
+    def simulate_guard(cls, grid: Grid, guard_pos: tuple[int, int]
+                       ) -> tuple[dict[tuple[int, int], None], bool]:
+        """
+        Simulate the guard's route through the map, starting from the given position and
+        facing up, until she either leaves the map or enters a loop. The loop is found with
+        utils.cycles, which only remembers a bounded number of states however long the route
+        is, so the spaces on the route are recorded in a second pass.
+
+        Args:
+            grid: The map, as returned by find_guard() (or an overlay of it)
+            guard_pos: The guard's starting position, as (row, col)
+
+        Returns:
+            A tuple (Visited, Loop)
+                Visited - Each space that's been visited, in the order they were first visited,
+                as the keys of a dict
+                Loop - True if the guard entered a loop, False if she left the map.
+        """
+        step = cls.guard_step(grid)
+        state = cls.guard_state(grid, guard_pos)
+        is_loop, tail, cycle = cycles.find_cycle(state, step)
+        stats.count("trials")
+        stats.count("guard_steps", tail + cycle)
+        # Walk the route again, now that we know how long it is, to record the spaces on it
+        top, left, _, right = grid.bounds
+        width = right - left
+        spaces_visited = {}
+        for _ in range(tail + cycle):
+            row, col = divmod(state // 4, width)
+            spaces_visited[(row + top, col + left)] = None
+            state = step(state)
+        return spaces_visited, is_loop
+
+    @classmethod
+    def guard_loops(cls, grid: Grid, guard_pos: tuple[int, int]) -> bool:
+        """
+        Check whether the guard gets stuck in a loop, without recording her route
+
+        Args:
+            grid: The map, as returned by find_guard() (or an overlay of it)
+            guard_pos: The guard's starting position, as (row, col)
+
+        Returns:
+            True if the guard entered a loop, False if she left the map.
+        """
+        is_loop, tail, cycle = cycles.find_cycle(cls.guard_state(grid, guard_pos),
+                                                 cls.guard_step(grid))
+        stats.count("trials")
+        stats.count("guard_steps", tail + cycle)
+        return is_loop
+
+    @classmethod
+    def part_1(cls, in_data: tuple[Grid, tuple[int, int]]) -> str:
         """
         Today's challenge is to analyze a "map" of a building, which is a 2D array containing
         three types of characters: '.', which represent empty spaces; '#', which represent
@@ -41,39 +186,17 @@ class DayCode(Day):
         method allows us to remember the specifics of each prior space visited, if necessary.
 
         Args:
-            in_str: The input string, representing a map.
+            in_data: The map and the guard's starting position, as returned by parse()
 
         Returns:
             The number of distinct spaces visited
         """
-        # Map each space that's been visited to the direction(s) the guard was traveling in
-            # when she visited that space.
-        spaces_visited: dict[tuple[int, int], list[cls.Direction]] = {}
-        grid = in_str.splitlines()
-        curr_direction = cls.Direction.UP.value
-        guard_raw_pos = in_str.find("^")
-        # Assumption: The grid is always rectangular
-        guard_pos = (guard_raw_pos // (len(grid[0]) + 1), guard_raw_pos % (len(grid[0]) + 1))
-
-        while (guard_pos not in spaces_visited or
-               curr_direction not in spaces_visited[guard_pos]):
-            next_pos = (guard_pos[0] + curr_direction[0],
-                        guard_pos[1] + curr_direction[1])
-            spaces_visited.setdefault(guard_pos, [])
-            spaces_visited[guard_pos].append(curr_direction)
-            # If we leave the map, stop tracking
-            if next_pos[0] not in range(0, len(grid)) or next_pos[1] not in range(0, len(grid[0])):
-                break
-            # If we hit a wall, turn
-            if grid[next_pos[0]][next_pos[1]] == '#':
-                curr_direction = cls.Direction.TURN_RIGHT.value[curr_direction]
-                continue
-            # Otherwise, move forward
-            guard_pos = next_pos
+        grid, guard_pos = in_data
+        spaces_visited, _ = cls.simulate_guard(grid, guard_pos)
         return len(spaces_visited)
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: tuple[Grid, tuple[int, int]]) -> str:
         """
         The twist for part 2 is that we now have to force the guard into a loop, which luckily my
         part 1 code can already detect. We do this by adding any single new obstruction ('#') to
@@ -87,44 +210,54 @@ class DayCode(Day):
         meaningfully change the efficiency of the algorithm.
 
         Args:
-            in_str: The input string, representing a map.
+            in_data: The map and the guard's starting position, as returned by parse()
 
         Returns:
             The number of distinct spaces visited
         """
+        grid, guard_pos = in_data
+        # Each obstruction is placed on a copy-on-write overlay of the map, which is cleared
+        # before trying the next one, rather than rebuilding the whole map
+        trial_grid = grid.overlay()
         loop_count = 0
-        for char_idx, char in enumerate(in_str):
-            print (f"Calculating: {char_idx/len(in_str):.0%}", end="\r")
+        for position, char in progress.track(grid.items(), total=len(grid)):
             # If the space isn't empty, we can't put an obstruction there
             if char != '.':
                 continue
-            in_str_with_obstruction = in_str[:char_idx] + '#' + in_str[char_idx + 1:]
-            # Map each space that's been visited to the direction(s) the guard was traveling in
-                # when she visited that space.
-            spaces_visited: dict[tuple[int, int], list[cls.Direction]] = {}
-            grid = in_str_with_obstruction.splitlines()
-            curr_direction = cls.Direction.UP.value
-            guard_raw_pos = in_str_with_obstruction.find("^")
-            # Assumption: The grid is always rectangular
-            guard_pos = (guard_raw_pos // (len(grid[0]) + 1), guard_raw_pos % (len(grid[0]) + 1))
-
-            while (guard_pos not in spaces_visited or
-                curr_direction not in spaces_visited[guard_pos]):
-                next_pos = (guard_pos[0] + curr_direction[0],
-                            guard_pos[1] + curr_direction[1])
-                spaces_visited.setdefault(guard_pos, [])
-                spaces_visited[guard_pos].append(curr_direction)
-                # If we leave the map, stop tracking
-                if (next_pos[0] not in range(0, len(grid)) or
-                    next_pos[1] not in range(0, len(grid[0]))):
-                    break
-                # If we hit a wall, turn
-                if grid[next_pos[0]][next_pos[1]] == '#':
-                    curr_direction = cls.Direction.TURN_RIGHT.value[curr_direction]
-                    continue
-                # Otherwise, move forward
-                guard_pos = next_pos
-            # If we exit the loop without a break, it's because a loop was detected
-            else:
+            trial_grid[position] = '#'
+            if cls.guard_loops(trial_grid, guard_pos):
                 loop_count += 1
+            trial_grid.discard()
         return loop_count
+
+    @classmethod
+    def solve_both(cls, in_str: str) -> tuple[str, str]:
+        """
+        An obstruction can only change the guard's route if she would have walked into it, so
+        the only candidates worth trying for part 2 are the spaces on her route from part 1
+        (other than her starting position). That's usually a small fraction of the map, so we
+        walk the route once, then only try obstructions along it, each on an overlay of the map
+        as in part_2().
+
+        Args:
+            in_str: The input string, representing a map.
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        grid, guard_pos = cls.parse(in_str)
+        spaces_visited, _ = cls.simulate_guard(grid, guard_pos)
+
+        candidates = [space for space in spaces_visited if space != guard_pos]
+        trial_grid = grid.overlay()
+        loop_count = 0
+        # Try the candidates in batches, so that each batch shows up as a span when tracing
+        for start in progress.track(range(0, len(candidates), cls.CANDIDATE_BATCH_SIZE)):
+            batch = candidates[start:start + cls.CANDIDATE_BATCH_SIZE]
+            with tracing.span("obstruction batch", start=start, size=len(batch)):
+                for position in batch:
+                    trial_grid[position] = '#'
+                    if cls.guard_loops(trial_grid, guard_pos):
+                        loop_count += 1
+                    trial_grid.discard()
+        return str(len(spaces_visited)), str(loop_count)
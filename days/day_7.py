@@ -1,16 +1,23 @@
 """Day 7 of Advent of Code 2024"""
 import re
 from operator import mul, add
-from typing import Callable
+from typing import Callable, Iterable
+from utils import parallel, progress, stats
 from utils.abstract_day import Day
 
+# Equations with at least this many operands are checked from both ends at once, see
+# meet_in_the_middle(). Shorter ones are quicker to just search.
+MEET_IN_THE_MIDDLE_OPERANDS = 5
+
 class DayCode(Day):
     """
     Solutions to Day 7 of AOC, which you can find here: https://adventofcode.com/2024/day/7
     """
+    supports_streaming = True
+    supports_bytes = True
 
     @classmethod
-    def parse_input(cls, in_str: str) -> list[tuple[int, list[int]]]:
+    def parse(cls, in_str: str) -> list[tuple[int, list[int]]]:
         """
         Parse the input into a more usable form
 
@@ -21,18 +28,32 @@ class DayCode(Day):
             A list of the format [x, [y, z, ...]]
         """
         parsed = []
-        number_regexp = re.compile(r"\d+")
         for line in in_str.splitlines():
-            numbers = number_regexp.findall(line)
-            parsed.append((int(numbers[0]), [int(num) for num in numbers[1:]]))
+            parsed.append(cls.parse_equation(line))
         return parsed
 
+    @classmethod
+    def parse_equation(cls, line: str) -> tuple[int, list[int]]:
+        """
+        Parse a single equation from the input
+
+        Args:
+            line: The equation, of the format x: y z ...
+
+        Returns:
+            The equation, of the format (x, [y, z, ...])
+        """
+        numbers = re.findall(r"\d+", line)
+        return (int(numbers[0]), [int(num) for num in numbers[1:]])
+
     @classmethod
     def check_equation(cls, equation: tuple[int, list[int]],
                        operators: list[Callable[[int, int], int]]
                        ) -> list[list[Callable[[int, int], int]]]:
         """
-        Check if any sequence of operators can solve a given equation
+        Check if any sequence of operators can solve a given equation. Equations with enough
+        operands are checked from both ends, see meet_in_the_middle(), as long as every
+        operator can be undone.
 
         Args:
             equation: The equation object, (x, [y, z, ...]), 
@@ -42,21 +63,147 @@ class DayCode(Day):
         Returns:
             True if a solution exists, false otherwise
         """
-        equations = [equation]
-        while equations:
-            result, operands = equations.pop()
-            if len(operands) == 1:
-                if operands[0] == result:
+        if len(equation[1]) >= MEET_IN_THE_MIDDLE_OPERANDS:
+            inverses = cls.inverse_operators(operators)
+            # Multiplying by 0 can't be undone, so equations with a 0 are searched instead
+            if inverses is not None and min(equation[1]) > 0:
+                return cls.meet_in_the_middle(equation, operators, inverses)
+        result, operands = equation
+        # Each state is the value so far, and the index of the next operand. Different
+        # sequences of operators rarely reach the same state, so states aren't deduplicated.
+        states = [(operands[0], 1)]
+        expanded = 0
+        while states:
+            value, next_idx = states.pop()
+            expanded += 1
+            if next_idx == len(operands):
+                if value == result:
+                    stats.count("nodes_expanded", expanded)
                     return True
                 continue
             for operator in operators:
-                left_eval = operator(operands[0], operands[1])
-                simplified_equation = [left_eval] + operands[2:]
-                equations.append((result, simplified_equation))
+                states.append((operator(value, operands[next_idx]), next_idx + 1))
+        stats.count("nodes_expanded", expanded)
         return False
 
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def undo_add(cls, result: int, operand: int) -> int | None:
+        """
+        Find the x for which x + operand = result
+
+        Args:
+            result: The result of the addition
+            operand: The right-hand operand
+
+        Returns:
+            x, or None if it would be negative
+        """
+        left = result - operand
+        return left if left >= 0 else None
+
+    @classmethod
+    def undo_mul(cls, result: int, operand: int) -> int | None:
+        """
+        Find the x for which x * operand = result
+
+        Args:
+            result: The result of the multiplication
+            operand: The right-hand operand, which must not be 0
+
+        Returns:
+            x, or None if there isn't a whole number that works
+        """
+        left, remainder = divmod(result, operand)
+        return left if remainder == 0 else None
+
+    @classmethod
+    def undo_concat(cls, result: int, operand: int) -> int | None:
+        """
+        Find the x for which concat_integers(x, operand) = result, i.e. strip the operand's
+        digits off the end of the result
+
+        Args:
+            result: The result of the concatenation
+            operand: The right-hand operand
+
+        Returns:
+            x, or None if the result doesn't end with the operand's digits
+        """
+        shift = 10 ** len(str(operand))
+        left, remainder = divmod(result, shift)
+        return left if remainder == operand and left > 0 else None
+
+    @classmethod
+    def inverse_operators(cls, operators: list[Callable[[int, int], int]]
+                          ) -> list[Callable[[int, int], int | None]] | None:
+        """
+        Find the inverse of each operator, for working backwards from an equation's result
+
+        Args:
+            operators: The operators to invert
+
+        Returns:
+            The inverse of each operator, in the same order, or None if any of them can't be
+            inverted
+        """
+        inverses = {add: cls.undo_add, mul: cls.undo_mul, cls.concat_integers: cls.undo_concat}
+        if not all(operator in inverses for operator in operators):
+            return None
+        return [inverses[operator] for operator in operators]
+
+    @classmethod
+    def meet_in_the_middle(cls, equation: tuple[int, list[int]],
+                           operators: list[Callable[[int, int], int]],
+                           inverses: list[Callable[[int, int], int | None]]) -> bool:
+        """
+        Check if any sequence of operators can solve an equation by working from both ends.
+        Going forwards, we find every value the first few operands can evaluate to. Since the
+        operators are evaluated strictly left to right, the last operator applied is always
+        the one before the last operand, so going backwards, we undo the last few operands
+        from the result, to find every value that the operands before them would need to
+        evaluate to. If any value is in both sets, the equation can be solved.
+
+        Going backwards prunes far more than going forwards, since most operators can only be
+        undone for some results (e.g. only multiples of the operand can be divided by it). So
+        rather than splitting the operands in half, each step extends whichever set is
+        currently smaller, which picks the split point to suit the equation. Every operator
+        only ever increases a positive value, so forward values past the result are dropped.
+
+        Args:
+            equation: The equation object, (x, [y, z, ...]), where every operand is positive
+            operators: The valid operators to try between each operand
+            inverses: The inverse of each operator, from inverse_operators()
+
+        Returns:
+            True if a solution exists, false otherwise
+        """
+        result, operands = equation
+        forward = {operands[0]}
+        backward = {result}
+        low = 1
+        high = len(operands)
+        reached = 2
+        while low < high:
+            if len(forward) <= len(backward):
+                operand = operands[low]
+                forward = {value for left in forward for operator in operators
+                           if (value := operator(left, operand)) <= result}
+                low += 1
+                reached += len(forward)
+            else:
+                operand = operands[high - 1]
+                backward = {left for value in backward for inverse in inverses
+                            if (left := inverse(value, operand)) is not None}
+                high -= 1
+                reached += len(backward)
+            if not forward or not backward:
+                stats.count("values_reached", reached)
+                return False
+        stats.count("values_reached", reached)
+        return not forward.isdisjoint(backward)
+
+    @classmethod
+    def part_1(cls, in_data: list[tuple[int, list[int]]]) -> str:
         """
         Today's problem involves a collection of equations, written as "x: y z ...",
         where X is the result and y, z, etc. are operands. The trick is that we don't know
@@ -80,14 +227,13 @@ class DayCode(Day):
         would prevent it from working on some set of those operations, so I elected not to add them.
 
         Args:
-            in_str: The input string, of the format x: y z ...
+            in_data: The list of equations, as returned by parse()
 
         Returns:
             The sum of all the X values from the valid equations
         """
-        equations = cls.parse_input(in_str)
         total = 0
-        for equation in equations:
+        for equation in in_data:
             if cls.check_equation(equation, [mul, add]):
                 total += equation[0]
         return total
@@ -107,7 +253,7 @@ class DayCode(Day):
         return int(f"{a}{b}")
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: list[tuple[int, list[int]]]) -> str:
         """
         Part 2 adds another operator, concatenation ("||"). My previous solution covers this case.
 
@@ -119,15 +265,97 @@ class DayCode(Day):
         a quick and dirty progress bar, as I did in part 6, to show users a progress estimate.
 
         Args:
-            in_str: The input string, of the format x: y z ...
+            in_data: The list of equations, as returned by parse()
 
         Returns:
             The sum of all the X values from the valid equations
         """
-        equations = cls.parse_input(in_str)
         total = 0
-        for idx, equation in enumerate(equations):
-            print (f"Calculating: {idx/len(equations):.0%}", end="\r")
+        for equation in progress.track(in_data):
             if cls.check_equation(equation, [mul, add, cls.concat_integers]):
                 total += equation[0]
         return total
+
+    @classmethod
+    def solve_both(cls, in_str: str) -> tuple[str, str]:
+        """
+        Solve both parts at once. See solve_lines() for details.
+
+        Args:
+            in_str: The input string, of the format x: y z ...
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        return cls.solve_lines(in_str.splitlines())
+
+    @classmethod
+    def solve_lines(cls, lines: Iterable[str]) -> tuple[str, str]:
+        """
+        Part 2's operators are a superset of part 1's, so any equation that part 1 can solve,
+        part 2 can solve too. That means we only need to run the much slower part 2 check on
+        the equations that part 1 couldn't solve. Each equation is independent, so we can also
+        check them one at a time as we read them.
+
+        Args:
+            lines: The lines of the input, of the format x: y z ...
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        total = 0
+        concat_total = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            result, concat_result = cls.solve_equation(cls.parse_equation(line))
+            total += result
+            concat_total += concat_result
+        return str(total), str(concat_total)
+
+    @classmethod
+    def solve_equation(cls, equation: tuple[int, list[int]]) -> tuple[int, int]:
+        """
+        Check a single equation for both parts. See solve_lines() for details.
+
+        Args:
+            equation: The equation object, (x, [y, z, ...])
+
+        Returns:
+            The equation's contribution to the outputs for part 1 and part 2, which is x if
+            that part can solve it, or 0 if not.
+        """
+        if cls.check_equation(equation, [mul, add]):
+            return equation[0], equation[0]
+        if cls.check_equation(equation, [mul, add, cls.concat_integers]):
+            return 0, equation[0]
+        return 0, 0
+
+    @classmethod
+    def solve_record(cls, line: bytes) -> tuple[int, int]:
+        """
+        Check a single line of the input for both parts, for use with utils.parallel
+
+        Args:
+            line: The equation, as bytes, of the format x: y z ...
+
+        Returns:
+            The equation's contribution to the outputs for part 1 and part 2
+        """
+        return cls.solve_equation(cls.parse_equation(line.decode()))
+
+    @classmethod
+    def solve_bytes(cls, buffer: bytes) -> tuple[str, str]:
+        """
+        Every equation is independent, so we can check them in parallel. The input is split
+        into chunks of lines, which are checked on a pool of processes, and their totals
+        are added up.
+
+        Args:
+            buffer: The input from AoC, as a bytes-like object
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        total, concat_total = parallel.map_lines(buffer, cls.solve_record) or (0, 0)
+        return str(total), str(concat_total)
@@ -1,14 +1,17 @@
 """Day 8 of Advent of Code 2024"""
+import re
 from itertools import permutations, combinations
 from utils.abstract_day import Day
+from utils.grid import get_buffer_shape
 
 class DayCode(Day):
     """
     Solutions to Day 8 of AOC, which you can find here: https://adventofcode.com/2024/day/8
     """
+    supports_bytes = True
 
     @classmethod
-    def parse_input(cls, in_str: str) -> list[list[str]]:
+    def parse(cls, in_str: str) -> list[list[str]]:
         """
         Parse the input into a 2D array of characters
 
@@ -44,7 +47,7 @@ class DayCode(Day):
         return output
 
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def part_1(cls, in_data: list[list[str]]) -> str:
         """
         The problem today is a bit complex. We're given a map of antenna positions, which is
         a grid of characters on a map. Empty positions are marked with ".", while positions
@@ -69,15 +72,13 @@ class DayCode(Day):
         be useful to keep track of frequencies of antinodes for part 2.
 
         Args:
-            in_str: The input string from AoC, describing a map of antenna positions and frequencies
+            in_data: The map of antenna positions and frequencies, as returned by parse()
 
         Returns:
             The count of positions in the bounds of the grid with at least one antinode
         """
-        grid = cls.parse_input(in_str)
-
         antennae: dict[str, list[tuple[int, int]]] = {}
-        for i, row in enumerate(grid):
+        for i, row in enumerate(in_data):
             for j, char in enumerate(row):
                 if char != ".":
                     frequency_antennae = antennae.setdefault(char, [])
@@ -87,8 +88,8 @@ class DayCode(Day):
         for frequency, positions in antennae.items():
             freq_antinodes = cls.get_both_antinodes(positions)
             for antinode in freq_antinodes:
-                if (antinode[0] not in range(0, len(grid)) or
-                    antinode[1] not in range(0, len(grid[0]))):
+                if (antinode[0] not in range(0, len(in_data)) or
+                    antinode[1] not in range(0, len(in_data[0]))):
                     continue
                 antinodes_here = antinodes.setdefault(antinode, [])
                 antinodes_here.append(frequency)
@@ -117,7 +118,7 @@ class DayCode(Day):
         return output
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: list[list[str]]) -> str:
         """
         For part 2, the twist is that there's now an infinite number of antinodes for each
         pair of points, bounded only by the extent of the grid. In part 1, each pair only
@@ -133,15 +134,13 @@ class DayCode(Day):
         the reverse pair. This is functionally identical, but is more concise.
 
         Args:
-            in_str: The input string from AoC, describing a map of antenna positions and frequencies
+            in_data: The map of antenna positions and frequencies, as returned by parse()
 
         Returns:
             The count of positions in the bounds of the grid with at least one antinode
         """
-        grid = cls.parse_input(in_str)
-
         antennae: dict[str, list[tuple[int, int]]] = {}
-        for i, row in enumerate(grid):
+        for i, row in enumerate(in_data):
             for j, char in enumerate(row):
                 if char != ".":
                     frequency_antennae = antennae.setdefault(char, [])
@@ -149,8 +148,36 @@ class DayCode(Day):
 
         antinodes: dict[tuple[int, int], list[int]] = {}
         for frequency, positions in antennae.items():
-            freq_antinodes = cls.get_all_antinodes(positions, (len(grid), len(grid[0])))
+            freq_antinodes = cls.get_all_antinodes(positions, (len(in_data), len(in_data[0])))
             for antinode in freq_antinodes:
                 antinodes_here = antinodes.setdefault(antinode, [])
                 antinodes_here.append(frequency)
         return len(antinodes)
+
+    @classmethod
+    def solve_bytes(cls, buffer: bytes) -> tuple[str, str]:
+        """
+        Solve both parts directly on the raw bytes of the input, without building a 2D list.
+        A regex finds the antennae, and each one's position is worked out from its offset
+        in the input. From there, both parts are the same as before.
+
+        Args:
+            buffer: The input from AoC, as a bytes-like object
+
+        Returns:
+            The outputs for part 1 and part 2, as a tuple
+        """
+        height, width, stride = get_buffer_shape(buffer)
+        antennae: dict[bytes, list[tuple[int, int]]] = {}
+        for antenna in re.finditer(rb"[^.\r\n]", buffer):
+            frequency_antennae = antennae.setdefault(antenna[0], [])
+            frequency_antennae.append(divmod(antenna.start(), stride))
+
+        antinodes = set()
+        all_antinodes = set()
+        for positions in antennae.values():
+            for antinode in cls.get_both_antinodes(positions):
+                if 0 <= antinode[0] < height and 0 <= antinode[1] < width:
+                    antinodes.add(antinode)
+            all_antinodes.update(cls.get_all_antinodes(positions, (height, width)))
+        return str(len(antinodes)), str(len(all_antinodes))
@@ -10,9 +10,9 @@ class DayCode(Day):
     """
 
     @classmethod
-    def part_1(cls, in_str: str) -> str:
+    def part_1(cls, in_data: str) -> str:
         return ""
 
     @classmethod
-    def part_2(cls, in_str: str) -> str:
+    def part_2(cls, in_data: str) -> str:
         return ""
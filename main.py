@@ -2,12 +2,36 @@
 
 """Harness for all AOC days."""
 import argparse
+import atexit
 import importlib
 import re
 import sys
 from traceback import format_exc
-from os import listdir
-from utils import abstract_day
+from os import listdir, path
+from utils import abstract_day, harness, parallel, progress, stats, tracing
+from utils.result_cache import ResultCache
+
+def positive_int(value: str) -> int:
+    """
+    Parse an argument which must be a whole number of at least 1, e.g. a number of processes
+
+    Args:
+        value: The argument, as given on the command line
+
+    Returns:
+        The number
+
+    Raises:
+        argparse.ArgumentTypeError: If the argument isn't a whole number of at least 1
+    """
+    message = f"must be a whole number of at least 1, not {value!r}"
+    try:
+        number = int(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(message) from e
+    if number < 1:
+        raise argparse.ArgumentTypeError(message)
+    return number
 
 parser = argparse.ArgumentParser(description='Run the AoC problem solutions.')
 
@@ -30,32 +54,157 @@ group.add_argument("-s", "--sample_only",
                     help='run only the sample (excluding the full input)', action="store_true")
 group.add_argument("-i", "--input-only",
                     help='run only the full input (excluding the sample)', action="store_true")
+measure_group = parser.add_mutually_exclusive_group()
+measure_group.add_argument("--profile",
+                    help='run each part separately under cProfile, writing .pstats and collapsed '
+                    'stack (flamegraph) files for each part to the profiles directory',
+                    action="store_true")
+measure_group.add_argument("--memory",
+                    help='run each part separately under tracemalloc, printing the peak memory '
+                    'and top allocation sites for each part', action="store_true")
+measure_group.add_argument("--stats",
+                    help='run each part separately with counting enabled, printing the counters '
+                    'that the day records for each part (e.g. nodes expanded) and the hit rates '
+                    'of any memoized functions',
+                    action="store_true")
+parser.add_argument("--no-cache",
+                    help="always solve each part, instead of reusing answers cached by previous "
+                    "runs with the same input and code", action="store_true")
+parser.add_argument("--stream-threshold",
+                    help="the input size in MiB at which days that support streaming read their "
+                    "input one line at a time, instead of all at once", type=float,
+                    default=harness.STREAM_THRESHOLD / (1024 * 1024))
+parser.add_argument("--workers", help="the number of processes to use for days that solve "
+                    "their input's records in parallel, or for solving files with --inputs "
+                    "(defaults to one per CPU)", type=positive_int, default=None)
+parser.add_argument("--throughput", help="show the throughput and estimated time left for "
+                    "long-running loops, instead of just their percentage", action="store_true")
+parser.add_argument("--no-progress", help="never show progress for long-running loops, even "
+                    "when printing to a terminal", action="store_true")
+parser.add_argument("--trace", help="record a timeline of each phase of the run (reading, "
+                    "parsing, each part) to this file, as Chrome trace-event JSON which can be "
+                    "opened in Perfetto or chrome://tracing", metavar="FILE")
+parser.add_argument("--serve", help="instead of running a day, keep every day loaded and "
+                    "answer requests on a Unix domain socket, one JSON object per line, e.g. "
+                    '{"day": 6, "part": 1, "input": "input.txt"}', action="store_true")
+parser.add_argument("--socket", help="the path of the socket to serve on",
+                    default="aoc.sock")
+parser.add_argument("--hot-reload", help="when serving, reload a day's module whenever its "
+                    "source file changes", action="store_true")
+parser.add_argument("--timeout", help="run each part in its own process, and stop it if it takes "
+                    "longer than this many seconds, reporting its counters and progress so far "
+                    "(with --inputs, this applies to each file instead)", type=float)
+parser.add_argument("--max-mem", help="run each part in its own process, and stop it if the "
+                    "process uses more than this many MiB (with --inputs, this applies to each "
+                    "file instead)", type=float)
+parser.add_argument("--inputs", help="instead of the sample and input.txt, solve every file in "
+                    "this directory across a pool of processes, writing one line of JSON per "
+                    "part as each file finishes", metavar="DIR")
+parser.add_argument("--results", help="the file to write the results of --inputs to (defaults "
+                    "to standard output)", metavar="FILE")
+parser.add_argument("--profile-top", help="the number of functions to print for each part "
+                    "when profiling, sorted by cumulative time", type=int, default=20)
+parser.add_argument("--memory-top", help="the number of allocation sites to print for each "
+                    "part when measuring memory, sorted by size", type=int, default=10)
 args = parser.parse_args()
+use_budget = args.timeout is not None or args.max_mem is not None
+if use_budget and (args.profile or args.memory or args.stats):
+    parser.error("--timeout and --max-mem can't be used with --profile, --memory or --stats")
+max_mem = int(args.max_mem * 1024 * 1024) if args.max_mem is not None else None
+
+# Only import the profiler, memory tracer and watchdog when they're used, so they cost nothing
+# otherwise
+if args.profile:
+    from utils import profiling
+if args.memory:
+    from utils import memory
+if use_budget:
+    from utils import watchdog
+
+parallel.max_workers = args.workers
+if args.no_progress:
+    progress.enabled = False
+if args.throughput:
+    progress.reporter = progress.ThroughputReporter()
+if args.trace:
+    tracing.enabled = True
+    # Write the trace even if the run fails, since that's often when it's most useful
+    atexit.register(tracing.write, args.trace)
+
+if args.serve:
+    from utils import server
+    try:
+        server.serve(args.socket, args.hot_reload, None if args.no_cache else ResultCache())
+    except FileExistsError as e:
+        sys.exit(f"{e}, so the server couldn't start.")
+    sys.exit()
+
+if args.inputs:
+    from utils import batch
+    if not path.isdir(args.inputs):
+        sys.exit(f"The --inputs directory {args.inputs} doesn't exist.")
+    if args.results:
+        with open(args.results, "w", encoding="utf-8") as results_file:
+            failed = batch.solve_directory(args.day, args.inputs, results_file,
+                                           workers=args.workers, verbose=args.verbose,
+                                           timeout=args.timeout, max_mem=max_mem)
+    else:
+        failed = batch.solve_directory(args.day, args.inputs, workers=args.workers,
+                                       verbose=args.verbose, timeout=args.timeout,
+                                       max_mem=max_mem)
+    if failed:
+        sys.exit(f"{failed} input file(s) couldn't be solved, see the results for details.")
+    sys.exit()
 
 # Find the associated module by name and run it.
 day_module = importlib.import_module("days.day_" + str(args.day))
 day_code: abstract_day = day_module.DayCode
 input_url = f"https://adventofcode.com/2024/day/{args.day}/input"
+# Profiling, measuring memory, counting and budgets need the parts to actually run, so they skip
+# the cache
+use_cache = not (args.no_cache or args.profile or args.memory or args.stats or use_budget)
+cache = ResultCache() if use_cache else None
 
-if not args.input_only:
+def solve_input(label: str, input_path: str) -> tuple[str, str]:
+    """Solve both parts of the day for one input file, in whichever mode was chosen."""
+    if args.profile or args.memory or args.stats or use_budget:
+        with tracing.span("read"), open(input_path, "r", encoding="utf-8") as f:
+            in_str = f.read()
+        if args.profile:
+            return profiling.profile_parts(day_code, in_str,
+                                           f"profiles/day_{args.day}_{label.lower()}",
+                                           args.profile_top)
+        if args.memory:
+            return memory.measure_parts(day_code, in_str, args.memory_top)
+        if args.stats:
+            return stats.count_parts(day_code, in_str)
+        if use_budget:
+            return watchdog.budget_parts(day_code, in_str, args.timeout, max_mem)
+    return harness.solve_file(day_module, input_path, cache, args.stream_threshold * 1024 * 1024)
+
+def run_input(label: str, input_path: str) -> None:
+    """Solve both parts of the day for one input file, and print the outputs."""
     try:
-        with open("sample.txt", "r", encoding="utf-8") as f:
-            test_str = f.read()
-        try:
-            print(f"Day {args.day} Part 1 Sample Output: {day_code.part_1(test_str)}")
-            print(f"Day {args.day} Part 2 Sample Output: {day_code.part_2(test_str)}")
-        # Exceptions here will always be due to user error, and the type is unpredictable
-        except Exception as e: # pylint: disable=broad-exception-caught
-            if not args.verbose:
-                sys.exit("An unexpected exception occurred when attempting to run "
-                            f"the solution for day {args.day}. Make sure your input.txt file "
-                        f"is the one for day {args.day}, which you can find here: {input_url}."
-                        "\nIf you meant to run a different day, use the --day flag."
-                        "\nIf you want to print the exception instead of this message, use "
-                        "the --verbose flag\n")
-            else:
-                sys.exit(format_exc())
-    except FileNotFoundError:
+        with tracing.span(label, day=args.day, filename=input_path):
+            outputs = solve_input(label, input_path)
+        for part, output in enumerate(outputs, 1):
+            print(f"Day {args.day} Part {part} {label} Output: {output}")
+    # Exceptions here will always be due to user error, and the type is unpredictable
+    except Exception: # pylint: disable=broad-exception-caught
+        if not args.verbose:
+            sys.exit("An unexpected exception occurred when attempting to run "
+                    f"the solution for day {args.day}. Make sure your input.txt file "
+                f"is the one for day {args.day}, which you can find here: {input_url}."
+                "\nIf you meant to run a different day, use the --day flag."
+                "\nIf you want to print the exception instead of this message, use "
+                "the --verbose flag\n")
+        else:
+            sys.exit(format_exc())
+
+if not args.input_only:
+    if path.exists("sample.txt"):
+        run_input("Sample", "sample.txt")
+    else:
         WARNING = ("No sample.txt file was found, skipping sample runs...\n"
             "If you'd like to run the smaller input samples provided by AoC separately from the "
             "main problem input, create a file called `sample.txt` and place it in the AOC2024 "
@@ -68,26 +217,9 @@ if not args.input_only:
 
 
 if not args.sample_only:
-    try:
-        with open("input.txt", "r", encoding="utf-8") as f:
-            in_str = f.read()
-    except FileNotFoundError:
+    if not path.exists("input.txt"):
         sys.exit("No input.txt file was found, so the solution could not be run.\n"
             "If you'd like to run this solution, please create a file "
             "with your desired input text called `input.txt` and place it in the "
             "AOC2024 directory.\n")
-    try:
-        print(f"Day {args.day} Part 1 Full Output: {day_code.part_1(in_str)}")
-        print(f"Day {args.day} Part 2 Full Output: {day_code.part_2(in_str)}")
-
-    # Exceptions here will always be due to user error, and the type is unpredictable
-    except Exception as e: # pylint: disable=broad-exception-caught
-        if not args.verbose:
-            sys.exit("An unexpected exception occurred when attempting to run "
-                    f"the solution for day {args.day}. Make sure your input.txt file "
-                f"is the one for day {args.day}, which you can find here: {input_url}."
-                "\nIf you meant to run a different day, use the --day flag."
-                "\nIf you want to print the exception instead of this message, use "
-                "the --verbose flag\n")
-        else:
-            sys.exit(format_exc())
+    run_input("Full", "input.txt")
@@ -0,0 +1,49 @@
+"""Tests for Day 8, mainly that its bytes path agrees with its string path"""
+import unittest
+from days.day_8 import DayCode
+from utils.grid import get_buffer_shape
+
+SAMPLE = (
+    "............\n"
+    "........0...\n"
+    ".....0......\n"
+    ".......0....\n"
+    "....0.......\n"
+    "......A.....\n"
+    "............\n"
+    "............\n"
+    "........A...\n"
+    ".........A..\n"
+    "............\n"
+    "............\n"
+)
+
+class TestDay8(unittest.TestCase):
+    """
+    Check that Day 8 gives the sample's answers, whichever line endings the input uses
+    """
+    def test_sample(self):
+        """The string and bytes paths both give the sample's answers"""
+        self.assertEqual(DayCode.solve_both(SAMPLE), ("14", "34"))
+        self.assertEqual(DayCode.solve_bytes(SAMPLE.encode()), ("14", "34"))
+
+    def test_crlf(self):
+        """Windows line endings, with and without a final newline"""
+        crlf = SAMPLE.replace("\n", "\r\n").encode()
+        self.assertEqual(DayCode.solve_bytes(crlf), ("14", "34"))
+        # Without a newline at the end of the last row
+        self.assertEqual(DayCode.solve_bytes(crlf[:-2]), ("14", "34"))
+
+class TestGetBufferShape(unittest.TestCase):
+    """
+    Check the shape of grids with each kind of line ending
+    """
+    def test_line_endings(self):
+        """Height and width ignore the line endings, but the stride counts them"""
+        for grid in [b"abc\ndef\n", b"abc\ndef", b"abc\r\ndef\r\n", b"abc\r\ndef"]:
+            height, width, _ = get_buffer_shape(grid)
+            self.assertEqual((height, width), (2, 3), grid)
+        self.assertEqual(get_buffer_shape(b"abc\r\ndef")[2], 5)
+
+if __name__ == "__main__":
+    unittest.main()
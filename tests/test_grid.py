@@ -0,0 +1,44 @@
+"""Tests for the grids in utils.grid"""
+import unittest
+from utils.grid import Grid
+
+class TestOverlayGrid(unittest.TestCase):
+    """
+    Check that overlays render the same elements that they read
+    """
+    def test_str_unbounded_deleted(self):
+        """Deleting a parent's element from an unbounded overlay"""
+        parent = Grid(".")
+        parent[(0, 3)] = "x"
+        parent[(1, 1)] = "q"
+        parent[(1, 0)] = "r"
+        overlay = parent.overlay()
+        del overlay[(0, 3)]
+        # Deleting the only element in row 0 shrinks the overlay to row 1
+        self.assertEqual(str(overlay), "r\tq")
+        self.assertEqual(overlay[(1, 1)], "q")
+        self.assertEqual(str(parent), ".\t.\t.\tx\nr\tq\t.\t.")
+
+    def test_str_unbounded_edited(self):
+        """Writing outside of an unbounded parent's elements, and nesting overlays"""
+        parent = Grid(".")
+        parent[(0, 0)] = "a"
+        overlay = parent.overlay()
+        overlay[(1, 2)] = "b"
+        self.assertEqual(str(overlay), "a\t.\t.\n.\t.\tb")
+        nested = overlay.overlay()
+        del nested[(0, 0)]
+        self.assertEqual(str(nested), "b")
+
+    def test_str_bounded(self):
+        """Edits to a bounded overlay don't reach the parent"""
+        parent = Grid(".", (2, 2))
+        parent[(0, 0)] = "a"
+        overlay = parent.overlay()
+        del overlay[(0, 0)]
+        overlay[(1, 1)] = "b"
+        self.assertEqual(str(overlay), ".\t.\n.\tb")
+        self.assertEqual(str(parent), "a\t.\n.\t.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,43 @@
 """Define an abstract class for an AOC Day of code"""
 from abc import ABC, abstractmethod
+from typing import Iterable
+from utils import tracing
 
 class Day(ABC):
     """
     An abstract class for a Day of code
     """
+    # Days which implement solve_lines() set this to True, so the harness knows it can stream
+    # large inputs to them instead of reading the whole input into memory.
+    supports_streaming: bool = False
+    # Days which implement solve_bytes() set this to True, so the harness knows it can pass them
+    # a memory-mapped view of the input file instead of decoding it to a string.
+    supports_bytes: bool = False
+
+    @classmethod
+    def parse(cls, in_str: str) -> any:
+        """
+        Parse the input for a day. The harness calls this once per input and passes the
+        result to both parts, so days which share parsing between parts should override it.
+        The parts must not modify the parsed input, since it's shared between them.
+
+        Args:
+            in_str: The input string from AOC
+
+        Returns:
+            The parsed input. By default, this is the input string, unchanged.
+        """
+        return in_str
+
     @classmethod
     @abstractmethod
-    def part_1(cls, in_str: str) -> str:
+    def part_1(cls, in_data: any) -> str:
         """
         Run code for part 1 of a day
 
         Args:
-            in_str: The input string from AOC
+            in_data: The parsed input, as returned by parse(). Unless a day overrides parse(),
+            this is the input string from AOC.
 
         Returns:
             The output requested by AOC, as a string
@@ -20,13 +45,72 @@ class Day(ABC):
 
     @classmethod
     @abstractmethod
-    def part_2(cls, in_str:str) -> str:
+    def part_2(cls, in_data: any) -> str:
         """
         Run code for part 2 of a day
 
         Args:
-            in_str: The input string from AOC
+            in_data: The parsed input, as returned by parse(). Unless a day overrides parse(),
+            this is the input string from AOC.
 
         Returns:
             The output requested by AOC, as a string
         """
+
+    @classmethod
+    def solve_both(cls, in_str: str) -> tuple[str, str]:
+        """
+        Run code for both parts of a day in a single pass. The harness prefers this over calling
+        each part separately, so days whose parts share work should override it to compute the
+        shared results only once.
+
+        Args:
+            in_str: The input string from AOC
+
+        Returns:
+            The outputs requested by AOC for part 1 and part 2, as strings.
+            By default, this parses the input once and runs each part on the result.
+        """
+        with tracing.span("parse"):
+            in_data = cls.parse(in_str)
+        with tracing.span("part_1"):
+            output_1 = cls.part_1(in_data)
+        with tracing.span("part_2"):
+            output_2 = cls.part_2(in_data)
+        return str(output_1), str(output_2)
+
+    @classmethod
+    def solve_lines(cls, lines: Iterable[str]) -> tuple[str, str]:
+        """
+        Run code for both parts of a day, reading the input one line at a time, so that the
+        whole input never needs to be in memory at once. Only days which set supports_streaming
+        need to override this.
+
+        Args:
+            lines: The lines of the input string from AOC. Lines may still end with a newline,
+            and the lines can only be iterated over once.
+
+        Returns:
+            The outputs requested by AOC for part 1 and part 2, as strings.
+            By default, this joins the lines back together and calls solve_both(), so the
+            whole input is still read into memory.
+        """
+        return cls.solve_both("".join(lines))
+
+    @classmethod
+    def solve_bytes(cls, buffer: bytes) -> tuple[str, str]:
+        """
+        Run code for both parts of a day, reading the raw bytes of the input, so that the input
+        never needs to be decoded or copied. Only days which set supports_bytes need to
+        override this.
+
+        Args:
+            buffer: The input from AOC, as bytes or a read-only memory-mapped file. Both
+            support indexing, find() and regex searches without copying, but slicing copies.
+
+        Returns:
+            The outputs requested by AOC for part 1 and part 2, as strings.
+            By default, this decodes the input (with "\\r\\n" line endings turned into "\\n",
+            as when the input is read as text) and calls solve_both().
+        """
+        return cls.solve_both(bytes(buffer).decode("utf-8").replace("\r\n", "\n"))
@@ -0,0 +1,133 @@
+"""
+A module for solving one day for every input file in a directory, across a pool of processes
+"""
+import importlib
+import json
+import multiprocessing
+import sys
+import time
+from os import cpu_count, listdir, path
+from traceback import format_exc
+from types import ModuleType
+from typing import TextIO
+from utils import harness, parallel, progress, watchdog
+
+# The worker's day module (imported once when the worker starts rather than once per file)
+# and settings
+_worker_state: dict[str, ModuleType | bool | float | int | None] = {}
+
+def _init_worker(day: int, verbose: bool, timeout: float | None, max_mem: int | None) -> None:
+    """
+    Import the day in a worker. Each worker solves whole files, so the day's own records
+    are solved in the worker rather than across another pool (which a pool's workers can't
+    start anyway), and progress bars are hidden since the workers would all draw over each other.
+
+    Args:
+        day: The day to import
+        verbose: True to include the full traceback in the results when a file fails
+        timeout: The most time each file can take, in seconds, or None for no limit
+        max_mem: The most memory the worker can use while solving a file, in bytes, or None
+        for no limit
+    """
+    _worker_state["module"] = importlib.import_module(f"days.day_{day}")
+    _worker_state["verbose"] = verbose
+    _worker_state["timeout"] = timeout
+    _worker_state["max_mem"] = max_mem
+    parallel.max_workers = 1
+    progress.enabled = False
+    if timeout is not None or max_mem is not None:
+        watchdog.start_recording()
+
+def _solve(filename: str) -> list[dict]:
+    """
+    Solve both parts of the worker's day for one file
+
+    Args:
+        filename: The path of the input file
+
+    Returns:
+        One result per part, as a dict with the file, part, answer and duration, or a single
+        result with the file and an error message if the file couldn't be solved
+    """
+    timeout = _worker_state["timeout"]
+    max_mem = _worker_state["max_mem"]
+    watchdog.reset_recording()
+    start = time.perf_counter()
+    try:
+        with watchdog.budget(timeout, max_mem):
+            outputs = harness.solve_file(_worker_state["module"], filename)
+    except watchdog.PartTimeout:
+        return [{"file": filename, "error": f"timed out after {timeout:g}s",
+                 **watchdog.partial_state()}]
+    except MemoryError:
+        return [{"file": filename, "error": watchdog.out_of_memory(max_mem),
+                 **watchdog.partial_state()}]
+    # The days can raise anything for a bad input, and it shouldn't stop the rest of the batch
+    except Exception as e: # pylint: disable=broad-exception-caught
+        error = format_exc() if _worker_state["verbose"] else f"{type(e).__name__}: {e}"
+        return [{"file": filename, "error": error}]
+    duration = round(time.perf_counter() - start, 6)
+    return [{"file": filename, "part": part, "answer": output, "duration": duration}
+            for part, output in enumerate(outputs, 1)]
+
+def list_inputs(directory: str) -> list[str]:
+    """
+    List the input files in a directory, skipping hidden files and subdirectories
+
+    Args:
+        directory: The directory to list
+
+    Returns:
+        The paths of the input files, sorted by name
+    """
+    return [path.join(directory, filename) for filename in sorted(listdir(directory))
+            if not filename.startswith(".") and path.isfile(path.join(directory, filename))]
+
+def solve_directory(day: int, directory: str, out: TextIO = sys.stdout,
+                    workers: int | None = None, verbose: bool = False,
+                    timeout: float | None = None, max_mem: int | None = None) -> int:
+    """
+    Solve both parts of a day for every input file in a directory, and write each result as a
+    line of JSON as soon as its file is solved, e.g.:
+        {"file": "inputs/a.txt", "part": 1, "answer": "41", "duration": 0.012}
+    Files finish in whichever order the workers get to them, not in the order they're listed.
+    Both parts are solved together, so the duration is the time taken to solve both parts of
+    the file, and is the same for each part. Answers are never read from the result cache,
+    since each file is usually only solved once, and the durations should be real.
+
+    A file which runs out of its time or memory budget is reported as an error, along with the
+    counters and progress it had recorded, and its worker moves on to the next file.
+
+    Args:
+        day: The day to solve
+        directory: The directory of input files
+        out: The file to write the results to
+        workers: The number of processes to use. Defaults to one per CPU.
+        verbose: True to include the full traceback in the results when a file fails
+        timeout: The most time each file can take, in seconds, or None for no limit
+        max_mem: The most memory each worker can use while solving a file (its whole address
+        space), in bytes, or None for no limit
+
+    Returns:
+        The number of files which couldn't be solved
+
+    Raises:
+        ValueError: If workers is less than 1
+    """
+    # Every option has a default, so callers only pass the ones they need, by name
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    filenames = list_inputs(directory)
+    if workers is not None and workers < 1:
+        raise ValueError(f"Need at least 1 worker, got {workers}")
+    workers = min(workers or cpu_count() or 1, max(len(filenames), 1))
+    failures = 0
+    with multiprocessing.Pool(workers, _init_worker,
+                              (day, verbose, timeout, max_mem)) as pool:
+        # Files are handed out one at a time, since they can take very different amounts of
+        # time, and there are rarely enough of them for the overhead to matter
+        for results in pool.imap_unordered(_solve, filenames):
+            for result in results:
+                failures += "error" in result
+                out.write(json.dumps(result) + "\n")
+            out.flush()
+    return failures
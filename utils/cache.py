@@ -0,0 +1,137 @@
+"""
+A module for memoizing functions which are called repeatedly with the same arguments, e.g. a
+check that both parts of a day run on the same data, with a bounded number of entries and
+counters for how often each cache is hit
+"""
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Hashable
+
+# The default number of entries each cache holds before evicting the least recently used one
+DEFAULT_MAX_SIZE = 4096
+
+class Memo:
+    """
+    The entries and counters for a single memoized function
+    """
+    def __init__(self, name: str, max_size: int):
+        """
+        Create an empty cache.
+
+        Args:
+            name: The name of the function, shown by report()
+            max_size: The most entries to hold at once
+        """
+        self.name = name
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Each entry holds the result and the arguments it was computed from. Holding the
+        # arguments keeps them alive, so a key function can use id() for unhashable arguments
+        # without the id being reused by a different object while the entry exists.
+        self.entries: OrderedDict[Hashable, tuple[object, tuple]] = OrderedDict()
+
+    def clear(self) -> None:
+        """
+        Remove every entry. The counters are kept until reset_stats().
+        """
+        self.entries.clear()
+
+    def reset_stats(self) -> None:
+        """
+        Reset the hit, miss and eviction counters
+        """
+        self.hits = self.misses = self.evictions = 0
+
+# Every cache created by memoize(), in the order they were created
+caches: list[Memo] = []
+
+def _default_key(*args, **kwargs) -> Hashable:
+    """
+    Make a key from all of the arguments, which must all be hashable
+
+    Returns:
+        The key
+    """
+    if kwargs:
+        return args, tuple(sorted(kwargs.items()))
+    return args
+
+def memoize(key: Callable[..., Hashable] | None = None, max_size: int = DEFAULT_MAX_SIZE,
+            name: str | None = None) -> Callable[[Callable], Callable]:
+    """
+    Memoize a function, keeping up to {max_size} results and evicting the least recently used
+    one when it's full. For a classmethod, put this below @classmethod, e.g.:
+        @classmethod
+        @cache.memoize(key=lambda cls, rules, update: (id(rules), tuple(update)))
+        def make_update_valid(cls, rules, update):
+    The function should always return the same result for the same key, and the result is
+    shared between calls, so callers must not modify it.
+
+    Args:
+        key: A function which takes the same arguments as the memoized function and returns
+        a hashable key for them, e.g. to turn a list into a tuple. Unhashable arguments which
+        aren't changed after the call can be keyed by id(), since the cache keeps them alive.
+        By default, the key is all of the arguments, which must then be hashable.
+        max_size: The most results to keep
+        name: The name shown by report(), which defaults to the function's qualified name
+
+    Returns:
+        A decorator which memoizes a function
+    """
+    key_func = key or _default_key
+
+    def decorator(func: Callable) -> Callable:
+        memo = Memo(name or func.__qualname__, max_size)
+        caches.append(memo)
+        entries = memo.entries
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            entry_key = key_func(*args, **kwargs)
+            entry = entries.get(entry_key)
+            if entry is not None:
+                memo.hits += 1
+                entries.move_to_end(entry_key)
+                return entry[0]
+            memo.misses += 1
+            result = func(*args, **kwargs)
+            entries[entry_key] = (result, args)
+            if len(entries) > memo.max_size:
+                entries.popitem(last=False)
+                memo.evictions += 1
+            return result
+        wrapper.memo = memo
+        return wrapper
+    return decorator
+
+def clear() -> None:
+    """
+    Remove every entry from every cache
+    """
+    for memo in caches:
+        memo.clear()
+
+def reset_stats() -> None:
+    """
+    Reset the counters of every cache
+    """
+    for memo in caches:
+        memo.reset_stats()
+
+def report(name: str) -> None:
+    """
+    Print the hits and misses of every cache which was used since the last reset_stats().
+
+    Args:
+        name: The name of the call that the counts are for, e.g. "part_1"
+    """
+    used = [memo for memo in caches if memo.hits or memo.misses]
+    if not used:
+        return
+    print(f"Caches for {name}:")
+    for memo in used:
+        hit_rate = memo.hits / (memo.hits + memo.misses)
+        print(f"    {memo.name}: {memo.hits:,} hits, {memo.misses:,} misses "
+              f"({hit_rate:.0%}), {memo.evictions:,} evictions, {len(memo.entries):,} entries")
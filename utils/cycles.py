@@ -0,0 +1,107 @@
+"""
+A module for detecting cycles in deterministic simulations, i.e. any sequence of states where
+each state is a function of the one before it
+"""
+from typing import Callable, Hashable, TypeVar
+
+State = TypeVar("State", bound=Hashable)
+
+# The default number of states to remember in find_cycle() before falling back to Brent's
+# algorithm. Each entry takes roughly 100 bytes (more for large states).
+DEFAULT_TABLE_SIZE = 1 << 16
+
+def brent(start: State, step: Callable[[State], State | None]) -> tuple[bool, int, int]:
+    """
+    Find the cycle in a sequence of states with Brent's algorithm, which only ever holds two
+    states at once, however long the sequence is. It takes at most about three times as many
+    steps as the sequence has distinct states.
+
+    Args:
+        start: The first state. States should be small and cheap to compare, e.g. an int
+        packing together all of the simulation's variables.
+        step: A function which takes a state and returns the next one, or None if the
+        simulation ends there. It must always return the same state for the same input.
+
+    Returns:
+        A tuple (Loop, Tail, Cycle)
+            Loop - True if the sequence repeats, False if it ends
+            Tail - If it repeats, the number of states before the cycle starts. If it ends,
+            the number of states in the sequence (including the first).
+            Cycle - The number of states in the cycle, or 0 if it ends
+    """
+    # Find the cycle's length: the hare moves ahead one step at a time, and the tortoise
+    # teleports to the hare at each power of two, until the hare lands on the tortoise
+    power = cycle = 1
+    steps = 1
+    tortoise = start
+    hare = step(start)
+    while hare != tortoise:
+        if hare is None:
+            return False, steps, 0
+        if power == cycle:
+            tortoise = hare
+            power *= 2
+            cycle = 0
+        hare = step(hare)
+        cycle += 1
+        steps += 1
+
+    # Find where the cycle starts: with the hare one cycle ahead of the tortoise, they
+    # meet at the first state in the cycle
+    tortoise = hare = start
+    for _ in range(cycle):
+        hare = step(hare)
+    tail = 0
+    while tortoise != hare:
+        tortoise = step(tortoise)
+        hare = step(hare)
+        tail += 1
+    return True, tail, cycle
+
+def find_cycle(start: State, step: Callable[[State], State | None],
+               table_size: int = DEFAULT_TABLE_SIZE) -> tuple[bool, int, int]:
+    """
+    Find the cycle in a sequence of states, by remembering the first {table_size} states in a
+    table, and only falling back to Brent's algorithm if the table fills up.
+
+    Most simulations end or repeat quickly, and remembering the states finds the cycle in a
+    single pass, whereas Brent's algorithm has to step through the sequence several times.
+    The table keeps memory bounded for the long simulations that Brent's algorithm is for.
+
+    Args:
+        start: The first state. See brent() for details.
+        step: A function which takes a state and returns the next one, or None if the
+        simulation ends there. See brent() for details.
+        table_size: The most states to remember. 0 always uses Brent's algorithm.
+
+    Returns:
+        A tuple (Loop, Tail, Cycle). See brent() for details.
+    """
+    seen: dict[State, int] = {}
+    state = start
+    index = 0
+    while index < table_size:
+        if state is None:
+            return False, index, 0
+        # One dict lookup both checks for the state and remembers it
+        first_index = seen.setdefault(state, index)
+        if first_index != index:
+            return True, first_index, index - first_index
+        state = step(state)
+        index += 1
+    if state is None:
+        return False, index, 0
+
+    is_loop, tail, cycle = brent(state, step)
+    if not is_loop:
+        return False, index + tail, 0
+    if tail > 0:
+        # The state the table stopped at isn't in the cycle, so neither is anything before it
+        return True, index + tail, cycle
+    # The cycle may have started before the table filled up, so check which of its states
+    # the table saw first
+    first_index = index
+    for _ in range(cycle):
+        first_index = min(first_index, seen.get(state, index))
+        state = step(state)
+    return True, first_index, cycle
@@ -2,7 +2,36 @@
 A module for a grid data structure and related functions
 """
 
+import mmap as mmap_module
+import struct
+from array import array
 from collections import abc
+from functools import lru_cache
+from typing import Iterable
+
+# The (row, col) offsets of each kind of neighbor, in clockwise order starting from up
+NEIGHBOR_OFFSETS: dict[str, tuple[tuple[int, int], ...]] = {
+    "4": ((-1, 0), (0, 1), (1, 0), (0, -1)),
+    "8": ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)),
+}
+
+def _get_offsets(kind: str | Iterable[tuple[int, int]]) -> tuple[tuple[int, int], ...]:
+    """
+    Get the (row, col) offsets for a kind of neighbor
+
+    Args:
+        kind: "4" for orthogonal neighbors, "8" to include diagonals, or a custom list of
+        (row, col) offsets
+
+    Returns:
+        The offsets, as a tuple
+    """
+    if isinstance(kind, str):
+        if kind not in NEIGHBOR_OFFSETS:
+            raise ValueError(f"unknown kind of neighbor {kind!r}, expected one of "
+                             f"{list(NEIGHBOR_OFFSETS)} or a list of offsets")
+        return NEIGHBOR_OFFSETS[kind]
+    return tuple((offset[0], offset[1]) for offset in kind)
 
 class Grid(abc.MutableMapping):
     """
@@ -31,15 +60,23 @@ class Grid(abc.MutableMapping):
         self._default = default
         self._data: dict[tuple[int, int], any] = {}
 
+    @property
+    def bounds(self) -> tuple[int, int, int, int] | None:
+        """
+        The bounds of the grid, as (top, left, bottom, right), or None if it's unbounded
+        """
+        return self._bounds
+
     def __str__(self, col_sep = "\t", row_sep = "\n") -> str:
+        # Render from a flat list of every element, rather than reading each element with
+        # __getitem__, then join each row in one go
         bounds: tuple[int, int, int, int] = self._get_current_bounds()
-        row_strs = []
-        for i in range(bounds[0], bounds[2]):
-            items = []
-            for j in range(bounds[1], bounds[3]):
-                items.append(str(self.__getitem__((i, j))))
-            row_strs.append(col_sep.join(items))
-        return row_sep.join(row_strs)
+        height, width = bounds[2] - bounds[0], bounds[3] - bounds[1]
+        if width == 0:
+            return row_sep.join([""] * height)
+        cells = list(map(str, self._flatten(bounds)))
+        return row_sep.join(col_sep.join(cells[start:start + width])
+                            for start in range(0, height * width, width))
 
     def __contains__(self, x: "Coordinate | tuple[int, int]"):
         # If the grid has no bounds, then it contains an entry for every index.
@@ -59,7 +96,11 @@ class Grid(abc.MutableMapping):
                 yield self.__getitem__((i, j))
 
     def __getitem__(self, position: "Coordinate | tuple[int, int]"):
-        if position not in self:
+        # This is the same check as __contains__, but inlined, since this is the hottest
+        # method on the grid
+        bounds = self._bounds
+        if bounds and not (bounds[0] <= position[0] < bounds[2] and
+                           bounds[1] <= position[1] < bounds[3]):
             raise IndexError(f"index {position} is out of range ("
                              f"[{self._bounds[0]}] - [{self._bounds[2]}], "
                              f"[{self._bounds[1]}] - [{self._bounds[3]}])")
@@ -121,6 +162,494 @@ class Grid(abc.MutableMapping):
         for key, value in self._data.items():
             yield (Coordinate(key), value)
 
+    def flatten(self) -> list:
+        """
+        Get every element of a bounded grid as a flat list, in row-major order, so the element
+        at (row, col) is at index (row - top) * width + (col - left). This is much faster than
+        reading each element, since only the elements that have been set are visited.
+
+        Returns:
+            The elements of the grid
+
+        Raises:
+            ValueError: If the grid is unbounded
+        """
+        if not self._bounds:
+            raise ValueError("only grids with bounds can be flattened")
+        return self._flatten(self._bounds)
+
+    def _flatten(self, bounds: tuple[int, int, int, int]) -> list:
+        """
+        Get every element within some bounds as a flat list, in row-major order. See flatten().
+
+        Args:
+            bounds: The bounds to flatten, as (top, left, bottom, right), which must contain
+            every element that has been set
+
+        Returns:
+            The elements within the bounds
+        """
+        top, left, bottom, right = bounds
+        width = right - left
+        flat = [self._default] * ((bottom - top) * width)
+        for (row, col), value in self._data.items():
+            flat[(row - top) * width + col - left] = value
+        return flat
+
+    def neighbors(self, position: "Coordinate | tuple[int, int]",
+                  kind: str | Iterable[tuple[int, int]] = "4") -> list[tuple[int, int]]:
+        """
+        Get the neighbors of a position which are inside the grid's bounds
+
+        Args:
+            position: The position to get the neighbors of, as (row, col)
+            kind: "4" for orthogonal neighbors, "8" to include diagonals, or a custom list of
+            (row, col) offsets
+
+        Returns:
+            The positions of the neighbors, as (row, col) tuples
+        """
+        row, col = position[0], position[1]
+        offsets = _get_offsets(kind)
+        bounds = self._bounds
+        if not bounds:
+            return [(row + d_row, col + d_col) for d_row, d_col in offsets]
+        return [(row + d_row, col + d_col) for d_row, d_col in offsets
+                if bounds[0] <= row + d_row < bounds[2] and bounds[1] <= col + d_col < bounds[3]]
+
+    def neighbor_table(self, kind: str | Iterable[tuple[int, int]] = "4") -> "NeighborTable":
+        """
+        Get a table of every cell's neighbors, by flat index. See NeighborTable for details.
+        Tables are cached by the grid's shape, so grids of the same size share one table.
+
+        Args:
+            kind: "4" for orthogonal neighbors, "8" to include diagonals, or a custom list of
+            (row, col) offsets
+
+        Returns:
+            The table
+
+        Raises:
+            ValueError: If the grid is unbounded, so doesn't have a fixed shape
+        """
+        if not self._bounds:
+            raise ValueError("neighbor tables need a grid with bounds")
+        top, left, bottom, right = self._bounds
+        return _get_neighbor_table(bottom - top, right - left, _get_offsets(kind))
+
+    def save(self, filename: str) -> None:
+        """
+        Save the grid to a file in a compact binary format, which load() can read back without
+        parsing. The file has a fixed-size header holding the bounds, the type of the elements
+        and the default value, followed by every element in row-major order.
+
+        Every element (and the default) must be of the same kind: either single characters,
+        which are stored as one byte each, ints, which are stored as 8-byte integers, or
+        floats (ints may be mixed in), which are stored as 8-byte floats.
+
+        Args:
+            filename: The path of the file to write
+
+        Raises:
+            TypeError: If the elements can't all be stored as one of the types above
+        """
+        bounds = self._get_current_bounds()
+        cells = self._flatten(bounds)
+        dtype = _get_dtype([self._default, *set(cells)])
+        header = _GRID_HEADER.pack(_GRID_MAGIC, *bounds, dtype.encode("ascii"),
+                                   _pack_value(dtype, self._default))
+        with open(filename, "wb") as f:
+            f.write(header)
+            if dtype == "c":
+                f.write("".join(cells).encode("latin-1"))
+            else:
+                f.write(array(dtype, cells).tobytes())
+
+    @classmethod
+    def load(cls, filename: str, mmap: bool = True) -> "ArrayGrid":
+        """
+        Load a grid saved by save().
+
+        Args:
+            filename: The path of the file to read
+            mmap: True to memory-map the file, so that elements are only read from disk as
+            they're used, False to read the whole file into memory. Either way, changes to the
+            grid are never written back to the file.
+
+        Returns:
+            The grid, which is bounded by the bounds of the grid that was saved, and is
+            stored densely rather than as a dict
+
+        Raises:
+            ValueError: If the file isn't a saved grid
+        """
+        with open(filename, "rb") as f:
+            if mmap:
+                # Copy-on-write, so the grid can still be changed without changing the file
+                buffer = mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_COPY)
+            else:
+                buffer = bytearray(f.read())
+        if len(buffer) < _GRID_HEADER.size:
+            raise ValueError(f"{filename} is not a saved grid")
+        magic, top, left, bottom, right, dtype, default = _GRID_HEADER.unpack_from(buffer)
+        if magic != _GRID_MAGIC:
+            raise ValueError(f"{filename} is not a saved grid")
+        dtype = dtype.decode("ascii")
+        return ArrayGrid(_unpack_value(dtype, default), (top, left, bottom, right), dtype,
+                         buffer, _GRID_HEADER.size)
+
+    def overlay(self) -> "OverlayGrid":
+        """
+        Create a copy-on-write view of this grid. Reads fall through to this grid, but writes
+        and deletions are only recorded in the overlay, so many speculative edits can be tried
+        against one large grid without copying it. The overlay sees any later changes made to
+        this grid, except where the overlay has its own edits.
+
+        Returns:
+            The overlay, which takes O(edits) memory
+        """
+        return OverlayGrid(self)
+
+# Marks an element that was deleted in an overlay, so it reads as the default rather than
+# falling through to the parent
+_DELETED = object()
+# Marks an element that the overlay hasn't edited, so it falls through to the parent
+_MISSING = object()
+
+class OverlayGrid(Grid):
+    """
+    A copy-on-write view of another grid, which only stores its own edits. See Grid.overlay().
+    """
+    def __init__(self, parent: Grid):
+        """
+        Create an overlay with no edits. Use Grid.overlay() rather than calling this directly.
+
+        Args:
+            parent: The grid to read through to. Its bounds and default are shared.
+        """
+        super().__init__(parent._default, parent._bounds)
+        self._parent = parent
+
+    def __getitem__(self, position: "Coordinate | tuple[int, int]"):
+        # Edits were bounds-checked when they were made, so only reads that fall through to the
+        # parent need to be checked
+        value = self._data.get((position[0], position[1]), _MISSING)
+        if value is _MISSING:
+            return self._parent[position]
+        return self._default if value is _DELETED else value
+
+    def __delitem__(self, position: "Coordinate | tuple[int, int]"):
+        if position not in self:
+            raise IndexError(f"index {position} is out of range ("
+                             f"[{self._bounds[0]}] - [{self._bounds[2]}], "
+                             f"[{self._bounds[1]}] - [{self._bounds[3]}])")
+        self._data[(position[0], position[1])] = _DELETED
+
+    def _get_current_bounds(self) -> tuple[int, int, int, int]:
+        if self._bounds:
+            return self._bounds
+        keys = [key for key, _ in self.non_default_items()]
+        if not keys:
+            return (0, 0, 0, 0)
+        return (min(key[0] for key in keys), min(key[1] for key in keys),
+                max(key[0] for key in keys) + 1, max(key[1] for key in keys) + 1)
+
+    def _flatten(self, bounds: tuple[int, int, int, int]) -> list:
+        top, left, bottom, right = bounds
+        width = right - left
+        if not self._bounds:
+            # An unbounded parent can have elements outside of these bounds (ones which this
+            # overlay deleted), so only place the elements that are still set
+            flat = [self._default] * ((bottom - top) * width)
+            for (row, col), value in self.non_default_items():
+                flat[(row - top) * width + col - left] = value
+            return flat
+        flat = self._parent._flatten(bounds) # pylint: disable=protected-access
+        for (row, col), value in self._data.items():
+            flat[(row - top) * width + col - left] = self._default if value is _DELETED else value
+        return flat
+
+    def non_default_items(self):
+        for key, value in self._data.items():
+            if value is not _DELETED:
+                yield (Coordinate(key), value)
+        for key, value in self._parent.non_default_items():
+            if (key[0], key[1]) not in self._data:
+                yield (key, value)
+
+    def edits(self) -> int:
+        """
+        Get the number of elements this overlay has written or deleted
+
+        Returns:
+            The number of edits
+        """
+        return len(self._data)
+
+    def reset(self, position: "Coordinate | tuple[int, int]") -> None:
+        """
+        Undo this overlay's edit to one element, so that it reads through to the parent again.
+
+        Args:
+            position: The position of the element to reset
+        """
+        self._data.pop((position[0], position[1]), None)
+
+    def discard(self) -> None:
+        """
+        Undo all of this overlay's edits, so it can be reused for another set of edits.
+        """
+        self._data.clear()
+
+# The header of a saved grid: a magic string and version, the bounds (top, left, bottom,
+# right), the type of the elements (as an array typecode), and the default value, 56 bytes in all
+_GRID_HEADER = struct.Struct("<8s4qc7x8s")
+_GRID_MAGIC = b"AOCGRID1"
+
+def _get_dtype(values: Iterable) -> str:
+    """
+    Find the type to store some grid elements as
+
+    Args:
+        values: The distinct values of the elements, including the default
+
+    Returns:
+        The type, as an array typecode: "c" for single characters, "q" for ints or "d" for
+        floats
+
+    Raises:
+        TypeError: If the values can't all be stored as one of those types
+    """
+    types = {type(value) for value in values}
+    if types == {str} and all(len(value) == 1 and ord(value) < 256 for value in values):
+        return "c"
+    if types <= {int}:
+        return "q"
+    if types <= {int, float}:
+        return "d"
+    raise TypeError("only grids of single characters, ints or floats can be saved, not "
+                    f"{sorted(value_type.__name__ for value_type in types)}")
+
+def _pack_value(dtype: str, value: any) -> bytes:
+    """
+    Pack a single value into the 8 bytes used for the default value in a saved grid's header
+
+    Args:
+        dtype: The type of the grid's elements, from _get_dtype()
+        value: The value to pack
+
+    Returns:
+        The packed value
+    """
+    if dtype == "c":
+        return value.encode("latin-1").ljust(8, b"\0")
+    return struct.pack(f"<{dtype}", value)
+
+def _unpack_value(dtype: str, packed: bytes) -> any:
+    """
+    Unpack a single value packed by _pack_value()
+
+    Args:
+        dtype: The type of the grid's elements, from _get_dtype()
+        packed: The packed value
+
+    Returns:
+        The value
+    """
+    if dtype == "c":
+        return packed[:1].decode("latin-1")
+    return struct.unpack(f"<{dtype}", packed)[0]
+
+class ArrayGrid(Grid):
+    """
+    A bounded grid which stores every element densely in a buffer, rather than in a dict.
+    This is what Grid.load() returns, so that a saved grid can be used straight from a
+    memory-mapped file.
+    """
+    def __init__(self, default: any, bounds: tuple[int, int, int, int], dtype: str,
+                 buffer: bytearray, offset: int = 0):
+        """
+        Create a grid backed by a buffer. Use Grid.load() rather than calling this directly.
+
+        Args:
+            default: The default value, which deleted elements are set to
+            bounds: The bounds of the grid, as (top, left, bottom, right)
+            dtype: The type of the elements, from _get_dtype()
+            buffer: A writable buffer holding every element in row-major order
+            offset: The offset of the first element in the buffer
+        """
+        super().__init__(default, bounds)
+        self._dtype = dtype
+        # Keep a reference to the buffer, so a memory-mapped file stays open
+        self._buffer = buffer
+        self._cells = memoryview(buffer)[offset:].cast("B" if dtype == "c" else dtype)
+        self._width = bounds[3] - bounds[1]
+        if len(self._cells) != (bounds[2] - bounds[0]) * self._width:
+            raise ValueError("the buffer doesn't match the size of the grid")
+
+    def _index(self, position: "Coordinate | tuple[int, int]") -> int:
+        """
+        Get the index of a position in the buffer, checking that it's in bounds
+
+        Args:
+            position: The position, as (row, col)
+
+        Returns:
+            The index
+        """
+        bounds = self._bounds
+        if not (bounds[0] <= position[0] < bounds[2] and bounds[1] <= position[1] < bounds[3]):
+            raise IndexError(f"index {position} is out of range ("
+                             f"[{bounds[0]}] - [{bounds[2]}], "
+                             f"[{bounds[1]}] - [{bounds[3]}])")
+        return (position[0] - bounds[0]) * self._width + position[1] - bounds[1]
+
+    def __getitem__(self, position: "Coordinate | tuple[int, int]"):
+        value = self._cells[self._index(position)]
+        return chr(value) if self._dtype == "c" else value
+
+    def __setitem__(self, position: "Coordinate | tuple[int, int]", value: any) -> None:
+        self._cells[self._index(position)] = ord(value) if self._dtype == "c" else value
+
+    def __delitem__(self, position: "Coordinate | tuple[int, int]"):
+        self[position] = self._default
+
+    def _flatten(self, bounds: tuple[int, int, int, int]) -> list:
+        if self._dtype == "c":
+            return list(self._cells.tobytes().decode("latin-1"))
+        return self._cells.tolist()
+
+    def non_default_items(self):
+        top, left, _, _ = self._bounds
+        for index, value in enumerate(self._flatten(self._bounds)):
+            if value != self._default:
+                row, col = divmod(index, self._width)
+                yield (Coordinate((row + top, col + left)), value)
+
+class NeighborTable:
+    """
+    The neighbors of every cell in a grid of a given shape, where each cell is referred to by
+    its flat index, row * width + col (counting from the top-left of the grid's bounds).
+
+    Cells in the interior of the grid all have the same neighbors relative to themselves, so
+    their neighbors are found by adding a fixed offset to the index, with no bounds checks.
+    Only the cells in the border ring, whose neighbors may be out of bounds, are stored.
+    This keeps the table's memory proportional to the grid's perimeter rather than its area.
+    """
+    def __init__(self, height: int, width: int, offsets: tuple[tuple[int, int], ...]):
+        """
+        Build the table. Use Grid.neighbor_table() rather than calling this directly, so
+        that tables are shared between grids of the same shape.
+
+        Args:
+            height: The number of rows in the grid
+            width: The number of columns in the grid
+            offsets: The (row, col) offsets of each neighbor
+        """
+        self.height = height
+        self.width = width
+        # The offset of each neighbor's flat index from the cell's, for interior cells
+        self.offsets = tuple(d_row * width + d_col for d_row, d_col in offsets)
+        # The neighbors of each cell in the border ring, by flat index
+        self.border: dict[int, tuple[int, ...]] = {}
+        row_reach = max((abs(d_row) for d_row, _ in offsets), default=0)
+        col_reach = max((abs(d_col) for _, d_col in offsets), default=0)
+        for row in range(height):
+            if row_reach <= row < height - row_reach:
+                # Only the columns near the left and right edges are in the border
+                cols = {*range(min(col_reach, width)), *range(max(width - col_reach, 0), width)}
+            else:
+                cols = range(width)
+            for col in cols:
+                self.border[row * width + col] = tuple(
+                    (row + d_row) * width + col + d_col for d_row, d_col in offsets
+                    if 0 <= row + d_row < height and 0 <= col + d_col < width)
+
+    def __getitem__(self, index: int) -> tuple[int, ...] | list[int]:
+        """
+        Get the neighbors of a cell
+
+        Args:
+            index: The flat index of the cell
+
+        Returns:
+            The flat indexes of the cell's neighbors which are inside the grid
+        """
+        neighbors = self.border.get(index)
+        if neighbors is None:
+            return [index + offset for offset in self.offsets]
+        return neighbors
+
+    def __len__(self) -> int:
+        return self.height * self.width
+
+    def index(self, position: "Coordinate | tuple[int, int]") -> int:
+        """
+        Get the flat index of a position
+
+        Args:
+            position: The position, as (row, col), relative to the top-left of the grid
+
+        Returns:
+            The flat index
+        """
+        return position[0] * self.width + position[1]
+
+    def position(self, index: int) -> tuple[int, int]:
+        """
+        Get the position of a flat index
+
+        Args:
+            index: The flat index
+
+        Returns:
+            The position, as (row, col), relative to the top-left of the grid
+        """
+        return divmod(index, self.width)
+
+@lru_cache(maxsize=16)
+def _get_neighbor_table(height: int, width: int, offsets: tuple[tuple[int, int], ...]
+                        ) -> NeighborTable:
+    """
+    Get the neighbor table for a grid shape, building it the first time it's needed
+
+    Args:
+        height: The number of rows in the grid
+        width: The number of columns in the grid
+        offsets: The (row, col) offsets of each neighbor
+
+    Returns:
+        The table
+    """
+    return NeighborTable(height, width, offsets)
+
+def get_buffer_shape(buffer: bytes) -> tuple[int, int, int]:
+    """
+    Get the shape of a rectangular grid stored as raw bytes, with one row per line.
+    The position (row, col) is at offset row * stride + col.
+
+    Args:
+        buffer: The grid, as bytes or a memory-mapped file. Lines can end in "\n" or "\r\n",
+        and the last row may or may not end in a newline.
+
+    Returns:
+        A tuple (Height, Width, Stride)
+            Height - The number of rows
+            Width - The number of columns, not counting the newline
+            Stride - The offset between the start of each row, i.e. the width plus the newline
+    """
+    newline = buffer.find(b"\n")
+    if newline == -1:
+        return 1, len(buffer), len(buffer) + 1
+    stride = newline + 1
+    width = newline
+    # Windows line endings put a "\r" before each "\n", which isn't part of the grid
+    if width > 0 and buffer[width - 1] == ord("\r"):
+        width -= 1
+    # Every row but the last takes up a whole stride, and the last is at least {width} long
+    height = (len(buffer) - width) // stride + 1
+    return height, width, stride
+
 class Coordinate(tuple):
     """
     A coordinate on a 2D grid
@@ -0,0 +1,473 @@
+"""
+A module for searching grids: breadth-first search, Dijkstra, A* and flood fill.
+
+Every search works on flat indexes (row * width + col, see NeighborTable) rather than
+(row, col) tuples, and keeps its distances and parents in arrays rather than dicts, since
+that's several times faster in Python for large grids. Positions are only converted back to
+(row, col) when reading the results.
+"""
+import heapq
+from array import array
+from math import inf
+from typing import Callable, Iterable
+from utils.grid import Grid, NeighborTable
+
+def is_open(value: any) -> bool:
+    """
+    The default passability check, which treats '#' as a wall and anything else as open
+
+    Args:
+        value: The value of a cell
+
+    Returns:
+        True if the cell can be entered, False otherwise
+    """
+    return value != "#"
+
+def unit_cost(_value: any) -> int:
+    """
+    The default cost check, where every step costs 1
+
+    Args:
+        _value: The value of the cell being entered
+
+    Returns:
+        The cost of entering the cell
+    """
+    return 1
+
+class SearchResult:
+    """
+    The distances and parents found by a search, by flat index
+    """
+    def __init__(self, grid: Grid, table: NeighborTable, distances: array, parents: array,
+                 reached: int):
+        """
+        Wrap the results of a search. This is created by the search functions.
+
+        Args:
+            grid: The grid that was searched
+            table: The neighbor table used for the search
+            distances: The distance to each cell, or -1 (or inf) if it wasn't reached
+            parents: The cell each cell was reached from, or -1 for sources and unreached cells
+            reached: The flat index of the target the search stopped at, or -1 if it didn't stop
+            early
+        """
+        top, left, _, _ = grid._bounds # pylint: disable=protected-access
+        self._origin = (top, left)
+        self.table = table
+        self.distances = distances
+        self.parents = parents
+        self.reached = self.position(reached) if reached >= 0 else None
+
+    def index(self, position: tuple[int, int]) -> int:
+        """
+        Get the flat index of a position on the searched grid
+
+        Args:
+            position: The position, as (row, col)
+
+        Returns:
+            The flat index
+
+        Raises:
+            ValueError: If the position is outside of the searched grid
+        """
+        row, col = position[0] - self._origin[0], position[1] - self._origin[1]
+        if not (0 <= row < self.table.height and 0 <= col < self.table.width):
+            raise ValueError(f"position {position} is outside of the searched grid")
+        return self.table.index((row, col))
+
+    def position(self, index: int) -> tuple[int, int]:
+        """
+        Get the position of a flat index on the searched grid
+
+        Args:
+            index: The flat index
+
+        Returns:
+            The position, as (row, col)
+        """
+        row, col = self.table.position(index)
+        return (row + self._origin[0], col + self._origin[1])
+
+    def distance(self, position: tuple[int, int]) -> int | float | None:
+        """
+        Get the distance to a position from the nearest source
+
+        Args:
+            position: The position, as (row, col)
+
+        Returns:
+            The distance, or None if the position wasn't reached
+        """
+        distance = self.distances[self.index(position)]
+        return None if distance < 0 or distance == inf else distance
+
+    def path(self, position: tuple[int, int]) -> list[tuple[int, int]] | None:
+        """
+        Get the shortest path to a position, from the nearest source
+
+        Args:
+            position: The position, as (row, col)
+
+        Returns:
+            The positions on the path, starting with the source and ending with the position,
+            or None if the position wasn't reached
+        """
+        if self.distance(position) is None:
+            return None
+        path = []
+        index = self.index(position)
+        while index >= 0:
+            path.append(self.position(index))
+            index = self.parents[index]
+        path.reverse()
+        return path
+
+def _flat_index(grid: Grid, table: NeighborTable, position: tuple[int, int]) -> int:
+    """
+    Get the flat index of a position on a grid. Flat indexes wrap from the end of one row to
+    the start of the next, so positions outside of the grid are rejected rather than wrapped.
+
+    Args:
+        grid: The grid being searched
+        table: The neighbor table for the grid
+        position: The position, as (row, col)
+
+    Returns:
+        The flat index
+
+    Raises:
+        ValueError: If the position is outside of the grid's bounds
+    """
+    top, left, bottom, right = grid.bounds
+    if not (top <= position[0] < bottom and left <= position[1] < right):
+        raise ValueError(f"position {position} is outside of the grid's bounds {grid.bounds}")
+    return table.index((position[0] - top, position[1] - left))
+
+def _prepare(grid: Grid, sources: Iterable[tuple[int, int]], passable: Callable[[any], bool],
+             kind: str | Iterable[tuple[int, int]]
+             ) -> tuple[NeighborTable, list, bytearray, list[int]]:
+    """
+    Set up the state shared by every search
+
+    Args:
+        grid: The grid to search, which must have bounds
+        sources: The positions to start from
+        passable: A function which takes the value of a cell and returns True if it can be
+        entered
+        kind: The kind of neighbors to move between, as in Grid.neighbors()
+
+    Returns:
+        A tuple (Table, Cells, Blocked, Sources)
+            Table - The neighbor table for the grid
+            Cells - The values of the cells, by flat index
+            Blocked - 1 for each cell that can't be entered, and 0 for the rest
+            Sources - The flat indexes of the sources which can be entered
+
+    Raises:
+        ValueError: If the grid is unbounded, or a source is outside of its bounds
+    """
+    table = grid.neighbor_table(kind)
+    cells = grid.flatten()
+    # Only call the callback once for each distinct value, then map every cell in C
+    blocked_values = {value: 0 if passable(value) else 1 for value in set(cells)}
+    blocked = bytearray(map(blocked_values.__getitem__, cells))
+    source_indexes = []
+    for position in sources:
+        index = _flat_index(grid, table, position)
+        if not blocked[index]:
+            source_indexes.append(index)
+    return table, cells, blocked, source_indexes
+
+def _target_indexes(grid: Grid, table: NeighborTable,
+                    targets: Iterable[tuple[int, int]] | None) -> set[int]:
+    """
+    Convert target positions to flat indexes
+
+    Args:
+        grid: The grid being searched
+        table: The neighbor table for the grid
+        targets: The target positions, or None
+
+    Returns:
+        The flat indexes of the targets, which is empty if there are none
+
+    Raises:
+        ValueError: If a target is outside of the grid's bounds
+    """
+    if targets is None:
+        return set()
+    return {_flat_index(grid, table, position) for position in targets}
+
+def bfs(grid: Grid, sources: Iterable[tuple[int, int]],
+        passable: Callable[[any], bool] = is_open, kind: str | Iterable[tuple[int, int]] = "4",
+        targets: Iterable[tuple[int, int]] | None = None) -> SearchResult:
+    """
+    Find the fewest steps from the nearest source to every reachable cell, with a
+    breadth-first search. The search works one layer (distance) at a time.
+
+    Args:
+        grid: The grid to search, which must have bounds
+        sources: The positions to start from. Every source is at distance 0.
+        passable: A function which takes the value of a cell and returns True if it can be
+        entered. By default, anything except '#' can be entered.
+        kind: The kind of neighbors to move between, as in Grid.neighbors()
+        targets: If given, stop as soon as any of these positions is reached
+
+    Returns:
+        The results, where the distance to unreached cells is -1
+
+    Raises:
+        ValueError: If the grid is unbounded, or a source or target is outside of its bounds
+    """
+    # The search's state is kept in local variables, since they're faster to read in the
+    # inner loop than attributes
+    # pylint: disable=too-many-locals
+    table, _, blocked, frontier = _prepare(grid, sources, passable, kind)
+    target_indexes = _target_indexes(grid, table, targets)
+    distances = array("q", [-1]) * len(table)
+    parents = array("q", [-1]) * len(table)
+    # Cells that are blocked or already reached are never visited again, so share one buffer
+    seen = blocked
+    for index in frontier:
+        distances[index] = 0
+        seen[index] = 1
+        if index in target_indexes:
+            return SearchResult(grid, table, distances, parents, index)
+    border = table.border
+    offsets = table.offsets
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for index in frontier:
+            neighbors = border.get(index)
+            if neighbors is None:
+                neighbors = [index + offset for offset in offsets]
+            for neighbor in neighbors:
+                if seen[neighbor]:
+                    continue
+                seen[neighbor] = 1
+                distances[neighbor] = distance
+                parents[neighbor] = index
+                if neighbor in target_indexes:
+                    return SearchResult(grid, table, distances, parents, neighbor)
+                next_frontier.append(neighbor)
+        frontier = next_frontier
+    return SearchResult(grid, table, distances, parents, -1)
+
+def _best_first(grid: Grid, prepared: tuple[NeighborTable, list, bytearray, list[int]],
+                cost: Callable[[any], int | float], target_indexes: set[int],
+                heuristic: Callable[[int], int | float] | None) -> SearchResult:
+    """
+    The search shared by dijkstra() and a_star(), which always expands the cell with the lowest
+    distance (plus heuristic, for A*) next.
+
+    Args:
+        grid: The grid to search, which must have bounds
+        prepared: The neighbor table, cells, blocked cells and sources, from _prepare()
+        cost: A function which takes the value of a cell and returns the cost of entering it
+        target_indexes: The flat indexes of the targets, which can be empty
+        heuristic: A function which takes a flat index and returns a lower bound on its
+        distance to the nearest target, or None for no heuristic (i.e. Dijkstra)
+
+    Returns:
+        The results, where the distance to unreached cells is inf
+    """
+    # The search's state is kept in local variables, since they're faster to read in the
+    # inner loop than attributes
+    # pylint: disable=too-many-locals
+    table, cells, blocked, source_indexes = prepared
+    distances = array("d", [inf]) * len(table)
+    parents = array("q", [-1]) * len(table)
+    # Cache the cost of each distinct value, so the callback is only called a few times
+    costs = {}
+    queue = []
+    for index in source_indexes:
+        distances[index] = 0
+        queue.append((heuristic(index) if heuristic else 0, index))
+    heapq.heapify(queue)
+    done = blocked
+    border = table.border
+    offsets = table.offsets
+    while queue:
+        _, index = heapq.heappop(queue)
+        if done[index]:
+            continue
+        done[index] = 1
+        if index in target_indexes:
+            return SearchResult(grid, table, distances, parents, index)
+        distance = distances[index]
+        neighbors = border.get(index)
+        if neighbors is None:
+            neighbors = [index + offset for offset in offsets]
+        for neighbor in neighbors:
+            if done[neighbor]:
+                continue
+            value = cells[neighbor]
+            if value not in costs:
+                costs[value] = cost(value)
+            new_distance = distance + costs[value]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                parents[neighbor] = index
+                priority = new_distance + heuristic(neighbor) if heuristic else new_distance
+                heapq.heappush(queue, (priority, neighbor))
+    return SearchResult(grid, table, distances, parents, -1)
+
+def dijkstra(grid: Grid, sources: Iterable[tuple[int, int]],
+             passable: Callable[[any], bool] = is_open,
+             cost: Callable[[any], int | float] = unit_cost,
+             kind: str | Iterable[tuple[int, int]] = "4",
+             targets: Iterable[tuple[int, int]] | None = None) -> SearchResult:
+    """
+    Find the lowest cost from the nearest source to every reachable cell, with Dijkstra's
+    algorithm, using heapq as the priority queue.
+
+    Args:
+        grid: The grid to search, which must have bounds
+        sources: The positions to start from. Every source is at distance 0.
+        passable: A function which takes the value of a cell and returns True if it can be
+        entered. By default, anything except '#' can be entered.
+        cost: A function which takes the value of a cell and returns the cost of entering it,
+        which must not be negative. By default, every step costs 1.
+        kind: The kind of neighbors to move between, as in Grid.neighbors()
+        targets: If given, stop as soon as the cheapest path to any of these positions is found
+
+    Returns:
+        The results, where the distance to unreached cells is inf
+
+    Raises:
+        ValueError: If the grid is unbounded, or a source or target is outside of its bounds
+    """
+    # Every search option has a default, so callers only pass the ones they need, by name
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    prepared = _prepare(grid, sources, passable, kind)
+    return _best_first(grid, prepared, cost, _target_indexes(grid, prepared[0], targets), None)
+
+def a_star(grid: Grid, sources: Iterable[tuple[int, int]], target: tuple[int, int],
+           passable: Callable[[any], bool] = is_open,
+           cost: Callable[[any], int | float] = unit_cost,
+           kind: str | Iterable[tuple[int, int]] = "4",
+           heuristic: Callable[[tuple[int, int]], int | float] | None = None) -> SearchResult:
+    """
+    Find the lowest cost path from the nearest source to a target, with A*.
+
+    Args:
+        grid: The grid to search, which must have bounds
+        sources: The positions to start from. Every source is at distance 0.
+        target: The position to find a path to
+        passable: A function which takes the value of a cell and returns True if it can be
+        entered. By default, anything except '#' can be entered.
+        cost: A function which takes the value of a cell and returns the cost of entering it,
+        which must not be negative. By default, every step costs 1.
+        kind: The kind of neighbors to move between, as in Grid.neighbors()
+        heuristic: A function which takes a position and returns a lower bound on the cost
+        from there to the target, which must be consistent (it can't drop by more than the
+        cost of a step). By default, this is the number of steps to the target
+        ignoring walls (Manhattan distance for "4", Chebyshev for "8"), times the cheapest
+        cost of any open cell. Custom neighbors default to no heuristic, which is Dijkstra.
+
+    Returns:
+        The results, where the distance to unreached cells is inf. Only cells that were
+        explored have distances, so use Dijkstra to find the distance to every cell.
+
+    Raises:
+        ValueError: If the grid is unbounded, or a source or the target is outside of its
+        bounds
+    """
+    # Every search option has a default, so callers only pass the ones they need, by name
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    prepared = _prepare(grid, sources, passable, kind)
+    table = prepared[0]
+    target_index = _flat_index(grid, table, target)
+    if heuristic is not None:
+        top, left, _, _ = grid.bounds
+        width = table.width
+        def index_heuristic(index: int) -> int | float:
+            return heuristic((index // width + top, index % width + left))
+    elif kind in ("4", "8"):
+        index_heuristic = _steps_heuristic(prepared, target_index, cost, kind)
+    else:
+        index_heuristic = None
+    return _best_first(grid, prepared, cost, {target_index}, index_heuristic)
+
+def _steps_heuristic(prepared: tuple[NeighborTable, list, bytearray, list[int]],
+                     target_index: int, cost: Callable[[any], int | float],
+                     kind: str) -> Callable[[int], int | float]:
+    """
+    Make a_star()'s default heuristic, which is the number of steps to the target ignoring
+    walls, times the cheapest cost of any open cell
+
+    Args:
+        prepared: The neighbor table, cells, blocked cells and sources, from _prepare()
+        target_index: The flat index of the target
+        cost: A function which takes the value of a cell and returns the cost of entering it
+        kind: "4" to count steps as the Manhattan distance, or "8" for the Chebyshev distance
+
+    Returns:
+        A function which takes a flat index and returns a lower bound on its distance to the
+        target
+    """
+    table, cells, blocked, _ = prepared
+    width = table.width
+    target_row, target_col = divmod(target_index, width)
+    min_cost = min((cost(value) for value in
+                    {value for index, value in enumerate(cells) if not blocked[index]}),
+                   default=0)
+    def steps_heuristic(index: int) -> int | float:
+        row, col = divmod(index, width)
+        if kind == "4":
+            return min_cost * (abs(row - target_row) + abs(col - target_col))
+        return min_cost * max(abs(row - target_row), abs(col - target_col))
+    return steps_heuristic
+
+def flood_fill(grid: Grid, passable: Callable[[any], bool] = is_open,
+               kind: str | Iterable[tuple[int, int]] = "4") -> tuple[array, list[int]]:
+    """
+    Split the open cells of a grid into connected components (regions)
+
+    Args:
+        grid: The grid to fill, which must have bounds
+        passable: A function which takes the value of a cell and returns True if it's part of
+        a region. By default, anything except '#' is.
+        kind: The kind of neighbors that connect cells, as in Grid.neighbors()
+
+    Returns:
+        A tuple (Labels, Sizes)
+            Labels - The region of each cell, by flat index, or -1 if it isn't part of one.
+            Regions are numbered from 0, in the order of their first cell.
+            Sizes - The number of cells in each region
+    """
+    # The fill's state is kept in local variables, since they're faster to read in the inner
+    # loop than attributes
+    # pylint: disable=too-many-locals
+    table, _, blocked, _ = _prepare(grid, (), passable, kind)
+    labels = array("q", [-1]) * len(table)
+    sizes = []
+    border = table.border
+    offsets = table.offsets
+    seen = blocked
+    for start in range(len(table)):
+        if seen[start]:
+            continue
+        label = len(sizes)
+        seen[start] = 1
+        labels[start] = label
+        stack = [start]
+        size = 0
+        while stack:
+            index = stack.pop()
+            size += 1
+            neighbors = border.get(index)
+            if neighbors is None:
+                neighbors = [index + offset for offset in offsets]
+            for neighbor in neighbors:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    labels[neighbor] = label
+                    stack.append(neighbor)
+        sizes.append(size)
+    return labels, sizes
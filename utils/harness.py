@@ -0,0 +1,61 @@
+"""
+A module for solving a day's input files, shared by each of the harness's modes
+"""
+import mmap
+from os import path
+from types import ModuleType
+from utils import tracing
+from utils.result_cache import ResultCache, hash_file
+
+# Inputs at least this large are streamed to days which support it, instead of read in full
+STREAM_THRESHOLD = 64 * 1024 * 1024
+
+def solve_file(day_module: ModuleType, filename: str, cache: ResultCache | None = None,
+               stream_threshold: int = STREAM_THRESHOLD) -> tuple[str, str]:
+    """
+    Solve both parts of a day for one input file, reusing cached answers where possible.
+    Days which can read bytes are given a memory-mapped view of the file, so that it never needs
+    to be copied into memory. Otherwise, large files are streamed to days which support it.
+
+    Args:
+        day_module: The day's module, containing its DayCode class
+        filename: The path of the input file
+        cache: The cache to read and store answers in, or None to always solve the input
+        stream_threshold: The size in bytes at which inputs are streamed to days that support
+        it, one line at a time, instead of being read into memory in full
+
+    Returns:
+        The outputs for part 1 and part 2, as strings
+    """
+    day_code = day_module.DayCode
+    keys = []
+    if cache is not None:
+        with tracing.span("cache lookup"):
+            input_hash = hash_file(filename)
+            keys = [cache.key(day_module, input_hash, part) for part in (1, 2)]
+            outputs = [cache.get(key) for key in keys]
+        if None not in outputs:
+            return tuple(outputs)
+
+    size = path.getsize(filename)
+    # Empty files can't be memory-mapped, but they don't need to be
+    if day_code.supports_bytes and size > 0:
+        with open(filename, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                with tracing.span("solve_bytes"):
+                    outputs = day_code.solve_bytes(buffer)
+    else:
+        with open(filename, "r", encoding="utf-8") as f:
+            if day_code.supports_streaming and size >= stream_threshold:
+                with tracing.span("solve_lines"):
+                    outputs = day_code.solve_lines(f)
+            else:
+                with tracing.span("read"):
+                    in_str = f.read()
+                # Solve both parts together, so any work they share is only done once
+                with tracing.span("solve_both"):
+                    outputs = day_code.solve_both(in_str)
+    outputs = tuple(str(output) for output in outputs)
+    for key, output in zip(keys, outputs):
+        cache.put(key, output)
+    return outputs
@@ -0,0 +1,109 @@
+"""
+A module for measuring the peak memory used by the parts of a day with tracemalloc
+"""
+import sys
+import tracemalloc
+from typing import Callable
+from utils.abstract_day import Day
+
+# Only take a new snapshot once traced memory has grown this much past the previous one, so
+# that the number of snapshots taken grows logarithmically with the peak, not linearly.
+SNAPSHOT_GROWTH = 1.1
+
+def _format_size(size: int) -> str:
+    """
+    Format a size in bytes as a human-readable string
+
+    Args:
+        size: The size, in bytes
+
+    Returns:
+        The size, in the largest unit that keeps it above 1, e.g. "1.5 MiB"
+    """
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def measure_call(func: Callable, *args) -> tuple[any, int, tracemalloc.Snapshot]:
+    """
+    Call a function while tracing its memory allocations.
+
+    Most of a function's memory is freed when it returns, so a snapshot taken afterwards
+    would miss the allocations responsible for the peak. Instead, we take snapshots as
+    Python functions return (while their locals are still alive), whenever the traced memory
+    has grown enough since the last snapshot, and keep the largest.
+
+    Args:
+        func: The function to call
+        *args: The arguments to call the function with
+
+    Returns:
+        A tuple (Result, Peak, Snapshot)
+            Result - The return value of the function
+            Peak - The peak memory allocated during the call, in bytes
+            Snapshot - A snapshot of the allocations from close to the peak
+    """
+    largest = {"size": 0, "snapshot": None}
+    def on_event(_frame, event, _arg):
+        if event != "return":
+            return
+        current, _ = tracemalloc.get_traced_memory()
+        if largest["snapshot"] is None or current > largest["size"] * SNAPSHOT_GROWTH:
+            largest["size"] = current
+            largest["snapshot"] = tracemalloc.take_snapshot()
+
+    tracemalloc.start()
+    sys.setprofile(on_event)
+    try:
+        result = func(*args)
+    finally:
+        sys.setprofile(None)
+        _, peak = tracemalloc.get_traced_memory()
+        # Memory retained by the result counts as well, e.g. for parse()
+        on_event(None, "return", None)
+        tracemalloc.stop()
+    return result, peak, largest["snapshot"]
+
+def report(name: str, peak: int, snapshot: tracemalloc.Snapshot, top: int) -> None:
+    """
+    Print the peak memory for a call, and the sites responsible for the most allocations.
+
+    Args:
+        name: The name of the call to report on, e.g. "part_1"
+        peak: The peak memory allocated during the call, in bytes
+        snapshot: A snapshot of the allocations from close to the peak
+        top: The number of allocation sites to print
+    """
+    print(f"Peak memory for {name}: {_format_size(peak)}")
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        print(f"    {_format_size(stat.size):>12} in {stat.count:>9} blocks: "
+              f"{frame.filename}:{frame.lineno}")
+
+def measure_parts(day_code: type[Day], in_str: str, top: int = 10) -> tuple[str, str]:
+    """
+    Parse the input and run each part of a day separately, tracing memory allocations,
+    and print the peak memory and top allocation sites for each.
+
+    Args:
+        day_code: The day to run
+        in_str: The input string from AOC
+        top: The number of allocation sites to print for each part
+
+    Returns:
+        The outputs for part 1 and part 2, as strings
+    """
+    in_data, peak, snapshot = measure_call(day_code.parse, in_str)
+    report("parse", peak, snapshot, top)
+    outputs = []
+    for part, func in [("part_1", day_code.part_1), ("part_2", day_code.part_2)]:
+        output, peak, snapshot = measure_call(func, in_data)
+        report(part, peak, snapshot, top)
+        outputs.append(str(output))
+    return tuple(outputs)
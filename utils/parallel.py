@@ -0,0 +1,239 @@
+"""
+A module for processing the records (lines) or chunks of an input in parallel, across a pool of
+processes
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+from os import cpu_count
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+# The number of worker processes to use. None means one per CPU.
+max_workers: int | None = None # pylint: disable=invalid-name
+# Inputs smaller than this many bytes are processed in the current process, since starting
+# the pool would take longer than processing them.
+MIN_PARALLEL_SIZE = 64 * 1024
+# How many chunks to split the input into for each worker, so that a worker which gets
+# slow records doesn't hold up the rest of the pool.
+CHUNKS_PER_WORKER = 4
+
+# The worker's view of the shared input, set when the worker starts
+_shared_input: dict[str, shared_memory.SharedMemory] = {}
+
+def _add(total: int | tuple[int, ...] | None, result: int | tuple[int, ...]
+         ) -> int | tuple[int, ...]:
+    """
+    Add a record's result to a running total, element-wise if the results are tuples
+
+    Args:
+        total: The running total, or None if nothing has been added yet
+        result: The result to add
+
+    Returns:
+        The new total
+    """
+    if total is None:
+        return result
+    if isinstance(result, tuple):
+        return tuple(a + b for a, b in zip(total, result))
+    return total + result
+
+def _process_lines(data: bytes, record_func: Callable[[bytes], int | tuple[int, ...]]
+                   ) -> int | tuple[int, ...] | None:
+    """
+    Run a function on each non-blank line of some data, and sum the results
+
+    Args:
+        data: The data to process
+        record_func: The function to run on each line
+
+    Returns:
+        The sum of the results, or None if there were no lines
+    """
+    total = None
+    for line in data.splitlines():
+        if line.strip():
+            total = _add(total, record_func(line))
+    return total
+
+def _attach(name: str) -> None:
+    """
+    Attach a worker to the shared input.
+
+    Args:
+        name: The name of the shared memory block holding the input
+    """
+    _shared_input["input"] = shared_memory.SharedMemory(name=name)
+
+def _process_chunk(record_func: Callable[[bytes], int | tuple[int, ...]], start: int,
+                   end: int) -> int | tuple[int, ...] | None:
+    """
+    Run a function on each line in a chunk of the shared input, and sum the results
+
+    Args:
+        record_func: The function to run on each line
+        start: The offset of the start of the chunk, which is the start of a line
+        end: The offset of the end of the chunk (exclusive), which is the end of a line
+
+    Returns:
+        The sum of the results, or None if there were no lines in the chunk
+    """
+    return _process_lines(bytes(_shared_input["input"].buf[start:end]), record_func)
+
+def _summarize_chunk(chunk_func: Callable[[bytes, int], T], start: int, end: int,
+                     stop: int) -> T:
+    """
+    Run a function on a chunk of the shared input, along with the overlap after it
+
+    Args:
+        chunk_func: The function to run on the chunk
+        start: The offset of the start of the chunk
+        end: The offset of the end of the chunk (exclusive)
+        stop: The offset of the end of the overlap after the chunk (exclusive)
+
+    Returns:
+        The result of the function
+    """
+    return chunk_func(bytes(_shared_input["input"].buf[start:stop]), end - start)
+
+def split_lines(data: bytes, count: int) -> list[tuple[int, int]]:
+    """
+    Split some data into roughly equal chunks, without splitting any lines
+
+    Args:
+        data: The data to split
+        count: The number of chunks to aim for. There may be fewer if the lines are long.
+
+    Returns:
+        The (start, end) offsets of each chunk, where the end is exclusive
+    """
+    chunks = []
+    start = 0
+    for idx in range(1, count + 1):
+        if start >= len(data):
+            break
+        target = len(data) * idx // count
+        end = data.find(b"\n", max(target - 1, start)) + 1 if idx < count else len(data)
+        # If there are no more newlines, the last chunk runs to the end of the data
+        if end == 0:
+            end = len(data)
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+def _run_shared(data: bytes, func: Callable, tasks: list[tuple], workers: int) -> list:
+    """
+    Place some data in shared memory, and run a function for each of a list of tasks across a
+    pool of processes which can all read the data
+
+    Args:
+        data: The data to share
+        func: The function to run, which reads the data from _shared_input
+        tasks: The arguments to call the function with for each task
+        workers: The number of processes to use
+
+    Returns:
+        The result of each task, in the same order as the tasks
+    """
+    shared_input = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shared_input.buf[:len(data)] = data
+        with multiprocessing.Pool(workers, _attach, (shared_input.name,)) as pool:
+            return pool.starmap(func, tasks)
+    finally:
+        shared_input.close()
+        shared_input.unlink()
+
+def _worker_count(workers: int | None) -> int:
+    """
+    Get the number of processes to use, falling back to max_workers and then one per CPU
+
+    Args:
+        workers: The number of processes requested, or None for the default
+
+    Returns:
+        The number of processes to use
+
+    Raises:
+        ValueError: If the requested number (or max_workers) is less than 1
+    """
+    if workers is None:
+        workers = max_workers
+    if workers is None:
+        return cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Need at least 1 worker, got {workers}")
+    return workers
+
+def map_lines(data: bytes, record_func: Callable[[bytes], int | tuple[int, ...]],
+              workers: int | None = None) -> int | tuple[int, ...] | None:
+    """
+    Run a function on each line of some data across a pool of processes, and sum the results.
+    The data is placed in shared memory, and each worker is only sent the offsets of the
+    chunks to process, so the data itself is never pickled.
+
+    Args:
+        data: The data to process, as bytes or a memory-mapped file
+        record_func: The function to run on each non-blank line, which receives the line as
+        bytes, without its newline. It must return an int (e.g. 1 or 0 to count lines) or a
+        tuple of ints, which are summed element-wise. It must also be picklable, e.g. a
+        module-level function or a method of a DayCode class.
+        workers: The number of processes to use. Defaults to max_workers.
+
+    Returns:
+        The sum of the results, or None if there were no lines
+
+    Raises:
+        ValueError: If workers (or max_workers) is less than 1
+    """
+    workers = _worker_count(workers)
+    if workers == 1 or len(data) < MIN_PARALLEL_SIZE:
+        return _process_lines(bytes(data), record_func)
+
+    chunks = split_lines(data, workers * CHUNKS_PER_WORKER)
+    results = _run_shared(data, _process_chunk,
+                          [(record_func, start, end) for start, end in chunks], workers)
+    total = None
+    for result in results:
+        if result is not None:
+            total = _add(total, result)
+    return total
+
+def map_chunks(data: bytes, chunk_func: Callable[[bytes, int], T], overlap: int = 0,
+               workers: int | None = None) -> list[T]:
+    """
+    Split some data into chunks of roughly equal size, regardless of where its lines are, and
+    run a function on each chunk across a pool of processes. This is for inputs which aren't
+    made of independent lines, where each chunk is summarized in a way that can be combined
+    with the summaries of the chunks around it, e.g. by folding them from left to right.
+
+    Tokens can straddle the boundary between two chunks, so each chunk is given the {overlap}
+    bytes after it as well. A chunk owns the tokens which start inside it, so the function
+    should stop at the first token which starts at or after the end of its own bytes, and
+    the overlap should be at least the length of the longest token minus one.
+
+    Args:
+        data: The data to process, as bytes or a memory-mapped file
+        chunk_func: The function to run on each chunk. It receives the chunk followed by the
+        overlap, as bytes, and the length of the chunk itself (i.e. where the overlap starts).
+        It must be picklable, e.g. a module-level function or a method of a DayCode class.
+        overlap: The number of bytes after each chunk to also give to the function
+        workers: The number of processes to use. Defaults to max_workers.
+
+    Returns:
+        The result for each chunk, in the same order as the chunks. Small inputs are processed
+        in the current process as a single chunk, so there may be only one.
+
+    Raises:
+        ValueError: If workers (or max_workers) is less than 1
+    """
+    workers = _worker_count(workers)
+    if workers == 1 or len(data) < MIN_PARALLEL_SIZE:
+        return [chunk_func(data, len(data))]
+
+    count = workers * CHUNKS_PER_WORKER
+    bounds = [len(data) * idx // count for idx in range(count + 1)]
+    tasks = [(chunk_func, start, end, min(end + overlap, len(data)))
+             for start, end in zip(bounds, bounds[1:]) if start < end]
+    return _run_shared(data, _summarize_chunk, tasks, workers)
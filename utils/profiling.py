@@ -0,0 +1,129 @@
+"""
+A module for profiling the parts of a day with cProfile, and exporting the results
+"""
+import cProfile
+import pstats
+from os import makedirs, path
+from typing import Callable
+from utils.abstract_day import Day
+
+def profile_call(func: Callable, *args) -> tuple[any, pstats.Stats]:
+    """
+    Call a function under cProfile
+
+    Args:
+        func: The function to call
+        *args: The arguments to call the function with
+
+    Returns:
+        A tuple (Result, Stats)
+            Result - The return value of the function
+            Stats - The profiling stats for the call
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args)
+    return result, pstats.Stats(profiler)
+
+def _format_func(func: tuple[str, int, str]) -> str:
+    """
+    Format a pstats function key as a single frame of a collapsed stack
+
+    Args:
+        func: The function key, as (filename, line number, function name)
+
+    Returns:
+        The frame, as "function (file:line)", or just the name for built-in functions
+    """
+    filename, line, name = func
+    # Built-ins have no file, and their names are already descriptive, e.g. "<built-in method ...>"
+    if filename == "~":
+        return name
+    return f"{name} ({path.basename(filename)}:{line})"
+
+def collapse_stacks(stats: pstats.Stats) -> dict[str, float]:
+    """
+    Convert profiling stats into collapsed stacks, the format read by flamegraph tools.
+    cProfile only records caller/callee pairs rather than full stacks, so each function's
+    own time is split between its callers in proportion to the time spent under each caller.
+    This is exact for most code, but can misattribute time for functions that behave
+    differently depending on where they're called from.
+
+    Args:
+        stats: The profiling stats to convert
+
+    Returns:
+        A dictionary mapping each stack, as frames joined by ';' from the root, to the
+        time spent in the last frame of that stack, in seconds
+    """
+    # pstats maps each function to (primitive calls, calls, own time, cumulative time, callers),
+    # where callers maps each caller to the same stats, but limited to calls from that caller.
+    raw_stats: dict = stats.stats # pylint: disable=no-member
+    callees: dict[tuple, list[tuple]] = {}
+    for func, (_, _, _, _, callers) in raw_stats.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+    roots = [func for func, (*_, callers) in raw_stats.items() if not callers]
+
+    stacks: dict[str, float] = {}
+    def walk(func: tuple, stack: list[tuple], share: float):
+        own_time = raw_stats[func][2]
+        stack = stack + [func]
+        key = ";".join(_format_func(frame) for frame in stack)
+        stacks[key] = stacks.get(key, 0) + own_time * share
+        for callee in callees.get(func, []):
+            # Skip recursive calls, since their time is already counted by the outer call
+            if callee in stack:
+                continue
+            callee_cumulative = raw_stats[callee][3]
+            edge_cumulative = raw_stats[callee][4][func][3]
+            if callee_cumulative > 0:
+                walk(callee, stack, share * edge_cumulative / callee_cumulative)
+
+    for root in roots:
+        walk(root, [], 1)
+    return stacks
+
+def write_profile(stats: pstats.Stats, out_path: str) -> None:
+    """
+    Write profiling stats to disk, as both a .pstats file and a collapsed stack file.
+
+    Args:
+        stats: The profiling stats to write
+        out_path: The path to write to, without an extension. The stats are written to
+        {out_path}.pstats, and the collapsed stacks to {out_path}.collapsed
+    """
+    makedirs(path.dirname(out_path) or ".", exist_ok=True)
+    stats.dump_stats(out_path + ".pstats")
+    with open(out_path + ".collapsed", "w", encoding="utf-8") as f:
+        for stack, seconds in collapse_stacks(stats).items():
+            # Flamegraph tools expect integer sample counts, so use microseconds.
+            microseconds = round(seconds * 1_000_000)
+            if microseconds > 0:
+                f.write(f"{stack} {microseconds}\n")
+
+def profile_parts(day_code: type[Day], in_str: str, out_prefix: str,
+                  top: int = 20) -> tuple[str, str]:
+    """
+    Run each part of a day separately under cProfile, write the results to disk, and
+    print the functions with the highest cumulative time.
+
+    Args:
+        day_code: The day to run
+        in_str: The input string from AOC
+        out_prefix: The path prefix for the output files, e.g. "profiles/day_6_full".
+        Each file is named {out_prefix}_{part}, where part is "parse", "part_1" or "part_2".
+        top: The number of functions to print for each part
+
+    Returns:
+        The outputs for part 1 and part 2, as strings
+    """
+    in_data, stats = profile_call(day_code.parse, in_str)
+    write_profile(stats, f"{out_prefix}_parse")
+    outputs = []
+    for part, func in [("part_1", day_code.part_1), ("part_2", day_code.part_2)]:
+        output, stats = profile_call(func, in_data)
+        write_profile(stats, f"{out_prefix}_{part}")
+        print(f"Top {top} functions by cumulative time for {part} ({out_prefix}_{part}.pstats):")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        outputs.append(str(output))
+    return tuple(outputs)
@@ -0,0 +1,133 @@
+"""
+A module for reporting the progress of long-running loops, without slowing them down
+"""
+import sys
+import time
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Whether to report progress. None means only when stdout is a terminal, so that progress
+# doesn't end up in redirected output, or in the benchmarks.
+enabled: bool | None = None # pylint: disable=invalid-name
+# The minimum time between reports, in seconds
+MIN_INTERVAL = 0.1
+
+class Reporter:
+    """
+    Prints the progress of a loop as a percentage, overwriting the same line each time.
+    Subclass this and set the module's reporter to change what gets reported.
+    """
+    def __init__(self):
+        self._last_length = 0
+
+    def _write(self, message: str) -> None:
+        """
+        Overwrite the current line of stdout with a message
+
+        Args:
+            message: The message to write
+        """
+        sys.stdout.write("\r" + message.ljust(self._last_length))
+        sys.stdout.flush()
+        self._last_length = len(message)
+
+    def update(self, label: str, done: int, total: int | None,
+               elapsed: float) -> None: # pylint: disable=unused-argument
+        """
+        Report the progress of a loop. This only shows the percentage done, but subclasses can
+        use the elapsed time too.
+
+        Args:
+            label: What the loop is doing, e.g. "Calculating"
+            done: The number of items processed so far
+            total: The total number of items, or None if it isn't known
+            elapsed: The time since the loop started, in seconds
+        """
+        if total:
+            self._write(f"{label}: {done / total:.0%}")
+        else:
+            self._write(f"{label}: {done}")
+
+    def finish(self) -> None:
+        """
+        Clear the progress line once a loop is done, so it doesn't mix with later output.
+        """
+        if self._last_length:
+            self._write("")
+            sys.stdout.write("\r")
+            self._last_length = 0
+
+class ThroughputReporter(Reporter):
+    """
+    Prints the progress of a loop, along with its throughput and an estimate of the time left
+    """
+    def update(self, label: str, done: int, total: int | None, elapsed: float) -> None:
+        rate = done / elapsed if elapsed > 0 else 0
+        message = f"{label}: {done}"
+        if total:
+            message += f"/{total} ({done / total:.0%})"
+        message += f", {rate:,.0f} items/s"
+        if total and rate > 0:
+            message += f", ETA {(total - done) / rate:.1f}s"
+        self._write(message)
+
+# The reporter that loops report their progress to
+reporter: Reporter = Reporter()
+
+def is_enabled() -> bool:
+    """
+    Check whether progress should be reported
+
+    Returns:
+        True if progress is enabled, or if it's left to the default and stdout is a terminal
+    """
+    if enabled is None:
+        return sys.stdout.isatty()
+    return enabled
+
+def track(items: Iterable[T], label: str = "Calculating", total: int | None = None
+          ) -> Iterable[T]:
+    """
+    Wrap the items of a loop to report its progress, at most once every MIN_INTERVAL seconds.
+    When progress is disabled, the items are returned as-is, so the loop pays nothing for it.
+
+    Args:
+        items: The items to loop over
+        label: What the loop is doing, which is shown with its progress
+        total: The number of items. Defaults to len(items), if the items have a length.
+
+    Returns:
+        The items, in the same order
+    """
+    if not is_enabled():
+        return items
+    if total is None and hasattr(items, "__len__"):
+        total = len(items)
+    return _track(items, label, total)
+
+def _track(items: Iterable[T], label: str, total: int | None) -> Iterator[T]:
+    """
+    Yield the items of a loop, reporting its progress to the reporter. See track().
+
+    Args:
+        items: The items to loop over
+        label: What the loop is doing
+        total: The number of items, or None if it isn't known
+
+    Yields:
+        Each of the items, in order
+    """
+    start = time.perf_counter()
+    next_report = start
+    done = 0
+    try:
+        for item in items:
+            now = time.perf_counter()
+            if now >= next_report:
+                reporter.update(label, done, total, now - start)
+                next_report = now + MIN_INTERVAL
+            yield item
+            done += 1
+    finally:
+        reporter.finish()
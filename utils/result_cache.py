@@ -0,0 +1,248 @@
+"""
+A module for an on-disk cache of answers, keyed by the content of everything that produced them
+"""
+import ast
+import hashlib
+import importlib.util
+import tempfile
+from contextlib import suppress
+from os import listdir, makedirs, path, remove, replace, stat, stat_result, utime
+from types import ModuleType
+
+# When the cache is over its size limit, evict answers until it's down to this fraction of the
+# limit, so that the directory doesn't need to be scanned again on every put() once it's full
+EVICT_TO_FRACTION = 0.9
+# Answers are written to a temporary file with this prefix, then renamed into place, so other
+# processes never read a partly written answer. Keys are hex, so they never start with this.
+TEMP_PREFIX = ".tmp-"
+
+def _disk_size(entry_stat: stat_result) -> int:
+    """
+    Get the space a file actually takes up on disk, which is usually a whole block even for
+    a tiny answer
+
+    Args:
+        entry_stat: The result of stat() for the file
+
+    Returns:
+        The size on disk, in bytes, or the size of the file's content where the platform
+        doesn't report blocks (e.g. Windows)
+    """
+    blocks = getattr(entry_stat, "st_blocks", None)
+    return entry_stat.st_size if blocks is None else blocks * 512
+
+def hash_file(filename: str) -> str:
+    """
+    Hash the contents of a file, reading it in chunks so it never needs to fit in memory.
+
+    Args:
+        filename: The path of the file to hash
+
+    Returns:
+        The hash, as a hex string
+    """
+    file_hash = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+class ResultCache:
+    """
+    An on-disk cache of answers, with least-recently-used eviction once it exceeds a size limit.
+
+    Each answer is keyed by a hash of the input file, the source of the day's module (and the
+    utils modules it imports), and the part, so editing a day only invalidates that day's answers.
+    Each answer is stored in its own file, and the file's modification time tracks when it was
+    last used.
+    """
+    def __init__(self, cache_dir: str = ".aoc_cache", max_bytes: int = 1024 * 1024):
+        """
+        Create a cache, backed by the given directory.
+
+        Args:
+            cache_dir: The directory to store answers in. It's created if it doesn't exist.
+            max_bytes: The total size of the answers to keep on disk, in bytes. Once the cache
+            is larger than this, the least recently used answers are evicted.
+        """
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        # The total size of the answers on disk, which is only counted once (on the first
+        # put()) and then kept up to date, rather than scanning the directory on every put()
+        self._total_bytes: int | None = None
+        self._source_hashes: dict[str, str] = {}
+        makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def _find_utils_imports(cls, source: str) -> set[str]:
+        """
+        Find the names of all utils modules imported by some source code
+
+        Args:
+            source: The source code to check
+
+        Returns:
+            The set of imported utils modules, e.g. {"utils.grid"}
+        """
+        modules = set()
+        for node in ast.walk(ast.parse(source)):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names
+                               if alias.name.startswith("utils."))
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                if node.module == "utils":
+                    # e.g. "from utils import grid"
+                    modules.update(f"utils.{alias.name}" for alias in node.names)
+                elif node.module.startswith("utils."):
+                    modules.add(node.module)
+        return modules
+
+    def _hash_source(self, module: ModuleType) -> str:
+        """
+        Hash the source code of a module, and of every utils module it imports (transitively).
+
+        Args:
+            module: The module to hash
+
+        Returns:
+            The hash, as a hex string
+        """
+        if module.__name__ in self._source_hashes:
+            return self._source_hashes[module.__name__]
+        source_hash = hashlib.sha256()
+        to_visit = [module.__file__]
+        visited = set()
+        while to_visit:
+            filename = to_visit.pop()
+            if filename in visited:
+                continue
+            visited.add(filename)
+            with open(filename, "rb") as f:
+                source = f.read()
+            for imported in self._find_utils_imports(source):
+                spec = importlib.util.find_spec(imported)
+                # Skip anything that isn't a plain source file, e.g. "from utils import SomeClass"
+                if spec is not None and spec.origin and spec.origin.endswith(".py"):
+                    to_visit.append(spec.origin)
+        # Visit order can vary, so hash the files in a fixed order
+        for filename in sorted(visited):
+            with open(filename, "rb") as f:
+                source_hash.update(hashlib.sha256(f.read()).digest())
+        self._source_hashes[module.__name__] = source_hash.hexdigest()
+        return self._source_hashes[module.__name__]
+
+    def forget_source(self, module: ModuleType) -> None:
+        """
+        Forget the hash of a module's source, e.g. after it's been reloaded, so that it's
+        hashed again the next time it's used.
+
+        Args:
+            module: The module to forget
+        """
+        self._source_hashes.pop(module.__name__, None)
+
+    def key(self, module: ModuleType, input_hash: str, part: int) -> str:
+        """
+        Get the cache key for an answer.
+
+        Args:
+            module: The day's module
+            input_hash: The hash of the input file, from hash_file()
+            part: The part of the day, i.e. 1 or 2
+
+        Returns:
+            The key, as a hex string
+        """
+        key_hash = hashlib.sha256()
+        key_hash.update(input_hash.encode("ascii"))
+        key_hash.update(self._hash_source(module).encode("ascii"))
+        key_hash.update(f"part_{part}".encode("ascii"))
+        return key_hash.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """
+        Get an answer from the cache, marking it as recently used.
+
+        Args:
+            key: The key of the answer, from key()
+
+        Returns:
+            The answer, or None if it isn't in the cache
+        """
+        entry_path = path.join(self._cache_dir, key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                answer = f.read()
+            utime(entry_path)
+        except FileNotFoundError:
+            return None
+        return answer
+
+    def put(self, key: str, answer: str) -> None:
+        """
+        Add an answer to the cache, evicting the least recently used answers if the cache is full.
+        The answer is written to a temporary file and renamed into place, so that other processes
+        reading the cache (e.g. a server) never see it partly written.
+
+        Args:
+            key: The key of the answer, from key()
+            answer: The answer to store
+        """
+        entry_path = path.join(self._cache_dir, key)
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._scan())
+        # Replacing an answer frees the space the old one took up
+        try:
+            self._total_bytes -= _disk_size(stat(entry_path))
+        except FileNotFoundError:
+            pass
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._cache_dir, prefix=TEMP_PREFIX)
+        try:
+            with open(file_descriptor, "w", encoding="utf-8") as f:
+                f.write(answer)
+            replace(temp_path, entry_path)
+        finally:
+            # Only left behind if writing or renaming failed
+            with suppress(FileNotFoundError):
+                remove(temp_path)
+        self._total_bytes += _disk_size(stat(entry_path))
+        if self._total_bytes > self._max_bytes:
+            self._evict()
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        """
+        List the answers in the cache. Answers removed by another process while scanning
+        are skipped, as are answers that are still being written.
+
+        Returns:
+            A list of (Last Used, Size, Filename) for each answer, where the size is on disk
+        """
+        entries = []
+        for filename in listdir(self._cache_dir):
+            if filename.startswith(TEMP_PREFIX):
+                continue
+            try:
+                entry_stat = stat(path.join(self._cache_dir, filename))
+            except FileNotFoundError:
+                continue
+            entries.append((entry_stat.st_mtime, _disk_size(entry_stat), filename))
+        return entries
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used answers until the cache is within EVICT_TO_FRACTION
+        of its size limit. The directory is scanned again first, so that the total is exact
+        even if other processes have been using the same cache.
+        """
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        target = self._max_bytes * EVICT_TO_FRACTION
+        for _, size, filename in sorted(entries):
+            if total <= target:
+                break
+            try:
+                remove(path.join(self._cache_dir, filename))
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
@@ -0,0 +1,201 @@
+"""
+A module for a long-running solver, which keeps every day loaded and answers requests over a
+Unix domain socket, so that each request doesn't pay for starting Python and importing the days
+"""
+import importlib
+import json
+import re
+import socket
+import socketserver
+import stat as stat_module
+from os import listdir, remove, stat
+from types import ModuleType
+from utils import harness
+from utils.result_cache import ResultCache
+
+DEFAULT_SOCKET = "aoc.sock"
+
+class DayModules:
+    """
+    The loaded modules for every day, which can optionally be reloaded when their source changes
+    """
+    def __init__(self, days_dir: str = "days", hot_reload: bool = False,
+                 cache: ResultCache | None = None):
+        """
+        Import every day in the days directory.
+
+        Args:
+            days_dir: The directory containing the day_N.py files
+            hot_reload: True to reload a day's module whenever its source file changes
+            cache: The cache the days' answers are stored in, which needs to know when a
+            module is reloaded
+        """
+        self._hot_reload = hot_reload
+        self._cache = cache
+        self._modules: dict[int, ModuleType] = {}
+        self._mtimes: dict[int, int] = {}
+        for filename in listdir(days_dir):
+            match = re.fullmatch(r"day_(\d+)\.py", filename)
+            if match is not None:
+                day = int(match.group(1))
+                self._modules[day] = importlib.import_module(f"days.day_{day}")
+                self._mtimes[day] = stat(self._modules[day].__file__).st_mtime_ns
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def get(self, day: int) -> ModuleType:
+        """
+        Get the module for a day, reloading it first if hot reloading is on and it's changed.
+        Only the day's own module is reloaded, not the utils modules it imports.
+
+        Args:
+            day: The day to get
+
+        Returns:
+            The day's module
+
+        Raises:
+            KeyError: If there's no module for the day
+        """
+        module = self._modules[day]
+        if self._hot_reload:
+            mtime = stat(module.__file__).st_mtime_ns
+            if mtime != self._mtimes[day]:
+                module = importlib.reload(module)
+                self._modules[day] = module
+                self._mtimes[day] = mtime
+                if self._cache is not None:
+                    self._cache.forget_source(module)
+        return module
+
+def solve_request(day_modules: DayModules, request: dict, cache: ResultCache | None
+                  ) -> dict:
+    """
+    Answer a single request
+
+    Args:
+        day_modules: The loaded days
+        request: The request, as a dict with the day, the path of the input file and
+        optionally the part (1 or 2). If the part is missing or null, both parts are returned.
+        cache: The cache to read and store answers in, or None to always solve the input
+
+    Returns:
+        The response, as a dict with either the "outputs" (a list with one output per part
+        requested) or an "error" message
+    """
+    # Check the part first, so a bad request doesn't solve the whole day for nothing
+    part = request.get("part")
+    if part not in (None, 1, 2):
+        return {"error": f"Unknown part: {part}"}
+    try:
+        day_module = day_modules.get(int(request["day"]))
+        outputs = harness.solve_file(day_module, request["input"], cache)
+    except KeyError as e:
+        return {"error": f"Missing or unknown field: {e}"}
+    # The days can raise anything for a bad input, and it shouldn't stop the server
+    except Exception as e: # pylint: disable=broad-exception-caught
+        return {"error": f"{type(e).__name__}: {e}"}
+    if part is None:
+        return {"outputs": list(outputs)}
+    return {"outputs": [outputs[part - 1]]}
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Remove the socket left behind by a server that's no longer running, e.g. one that was
+    killed before it could clean up
+
+    Args:
+        socket_path: The path of the socket
+
+    Raises:
+        FileExistsError: If a server is still listening on the socket, or the path is
+        something other than a socket
+    """
+    try:
+        mode = stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat_module.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} already exists and isn't a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Nothing is listening, so it's left over from a server that's gone
+            remove(socket_path)
+            return
+    raise FileExistsError(f"Another server is already listening on {socket_path}")
+
+def serve(socket_path: str = DEFAULT_SOCKET, hot_reload: bool = False,
+          cache: ResultCache | None = None) -> None:
+    """
+    Listen on a Unix domain socket and answer requests until interrupted.
+
+    Each request is a single line of JSON, e.g. {"day": 6, "part": 1, "input": "input.txt"},
+    and each response is a single line of JSON, e.g. {"outputs": ["41"]}. A connection can
+    send any number of requests, one after another. Requests are answered one at a time, since
+    solving is limited by the CPU rather than waiting on anything.
+
+    Args:
+        socket_path: The path of the socket to listen on. A socket left behind by a server
+        that's no longer running is replaced.
+        hot_reload: True to reload a day's module whenever its source file changes
+        cache: The cache to read and store answers in, or None to always solve the input
+
+    Raises:
+        FileExistsError: If another server is listening on the socket, or the path is
+        something other than a socket
+    """
+    _remove_stale_socket(socket_path)
+    day_modules = DayModules(hot_reload=hot_reload, cache=cache)
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        """Answer each line of JSON sent over a connection"""
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    response = solve_request(day_modules, json.loads(line), cache)
+                except (ValueError, AttributeError):
+                    response = {"error": "Requests must be a JSON object on a single line"}
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+    with socketserver.UnixStreamServer(socket_path, RequestHandler) as server:
+        print(f"Serving {len(day_modules)} days on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            remove(socket_path)
+
+def send_request(day: int, filename: str, part: int | None = None,
+                 socket_path: str = DEFAULT_SOCKET) -> list[str]:
+    """
+    Send a single request to a running server. To send many requests, it's faster to keep
+    one connection open and write one line of JSON per request.
+
+    Args:
+        day: The day to solve
+        filename: The path of the input file, relative to the server's working directory
+        part: The part to solve (1 or 2), or None for both
+        socket_path: The path of the server's socket
+
+    Returns:
+        The outputs for the requested part(s)
+
+    Raises:
+        RuntimeError: If the server couldn't solve the request
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        message = {"day": day, "part": part, "input": filename}
+        client.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with client.makefile("rb") as response_file:
+            response = json.loads(response_file.readline())
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["outputs"]
@@ -0,0 +1,127 @@
+"""
+A module for counting the work done by the parts of a day, e.g. the number of nodes expanded
+in a search, so that algorithmic changes can be compared without relying on wall time
+"""
+from collections import Counter
+from typing import Callable
+from utils import cache
+from utils.abstract_day import Day
+
+# Whether counting is enabled. Use enable() and disable() to change it.
+enabled = False # pylint: disable=invalid-name
+# The counts recorded since the last reset(), keyed by name
+counters: Counter[str] = Counter()
+
+def _record(name: str, amount: int = 1) -> None:
+    """
+    Add to a named counter
+
+    Args:
+        name: The name of the counter, e.g. "nodes_expanded"
+        amount: The amount to add
+    """
+    counters[name] += amount
+
+def _ignore(name: str, amount: int = 1) -> None: # pylint: disable=unused-argument
+    """
+    Do nothing. This is what count() does while counting is disabled.
+
+    Args:
+        name: The name of the counter
+        amount: The amount that would have been added
+    """
+
+# Add to a named counter, if counting is enabled. This is swapped out by enable() and
+# disable() rather than checking whether it's enabled on each call, so it costs almost
+# nothing when disabled. Days should call it as stats.count(...) rather than importing it
+# directly, so they always get the current version.
+count: Callable[[str, int], None] = _ignore
+
+def enable() -> None:
+    """
+    Start counting
+    """
+    global enabled, count # pylint: disable=global-statement
+    enabled = True
+    count = _record
+
+def disable() -> None:
+    """
+    Stop counting. Existing counts are kept until reset().
+    """
+    global enabled, count # pylint: disable=global-statement
+    enabled = False
+    count = _ignore
+
+def reset() -> None:
+    """
+    Clear all of the counters
+    """
+    counters.clear()
+
+def counted(name: str, func: Callable) -> Callable:
+    """
+    Wrap a function so that each call to it adds to a named counter, e.g. to count the
+    comparisons made by a sort. Only wrap functions while counting is enabled, since the
+    wrapper slows down every call.
+
+    Args:
+        name: The name of the counter
+        func: The function to wrap
+
+    Returns:
+        The wrapped function
+    """
+    def wrapper(*args, **kwargs):
+        counters[name] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+def report(name: str) -> None:
+    """
+    Print the current counts, sorted by name.
+
+    Args:
+        name: The name of the call that the counts are for, e.g. "part_1"
+    """
+    if not counters:
+        print(f"Counters for {name}: none")
+        return
+    print(f"Counters for {name}:")
+    for counter, value in sorted(counters.items()):
+        print(f"    {counter}: {value:,}")
+
+def count_parts(day_code: type[Day], in_str: str) -> tuple[str, str]:
+    """
+    Parse the input and run each part of a day separately with counting enabled, and print
+    the counts for each, along with the hits and misses of any memoized functions they used.
+    Memoized results are cleared before each part, so each part's counts are its own work.
+
+    Args:
+        day_code: The day to run
+        in_str: The input string from AOC
+
+    Returns:
+        The outputs for part 1 and part 2, as strings
+    """
+    enable()
+    try:
+        reset()
+        cache.reset_stats()
+        in_data = day_code.parse(in_str)
+        report("parse")
+        cache.report("parse")
+        outputs = []
+        for part, func in [("part_1", day_code.part_1), ("part_2", day_code.part_2)]:
+            reset()
+            # Otherwise, part 2 could reuse results memoized by part 1, and its counters
+            # would leave out the work it needed to get them
+            cache.clear()
+            cache.reset_stats()
+            outputs.append(str(func(in_data)))
+            report(part)
+            cache.report(part)
+    finally:
+        disable()
+        reset()
+    return tuple(outputs)
@@ -0,0 +1,88 @@
+"""
+A module for recording a timeline of spans (e.g. reading the input, parsing, each part) as
+Chrome trace events, which can be opened in Perfetto (ui.perfetto.dev) or chrome://tracing
+"""
+import json
+import os
+import threading
+import time
+
+# Whether spans are recorded. While this is False, span() does nothing.
+enabled = False # pylint: disable=invalid-name
+# The events recorded so far, in the Chrome trace-event format
+events: list[dict] = []
+
+class _Span:
+    """
+    A context manager that records the time spent inside it as a complete ("X") event
+    """
+    def __init__(self, name: str, args: dict):
+        """
+        Create a span. Nothing is recorded until the span is exited.
+
+        Args:
+            name: The name of the span, shown on the timeline
+            args: Any extra details to attach to the span, shown when it's selected
+        """
+        self._name = name
+        self._args = args
+        self._start = 0
+
+    def __enter__(self) -> "_Span":
+        self._start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *_) -> None:
+        end = time.monotonic_ns()
+        events.append({
+            "name": self._name,
+            "cat": "aoc",
+            "ph": "X",
+            # Trace events are measured in microseconds
+            "ts": self._start / 1000,
+            "dur": (end - self._start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": self._args,
+        })
+
+class _NoSpan:
+    """
+    A context manager that does nothing, used while tracing is disabled
+    """
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *_) -> None:
+        pass
+
+_NO_SPAN = _NoSpan()
+
+def span(name: str, **args) -> _Span | _NoSpan:
+    """
+    Record the time spent in a block of code, e.g.:
+        with tracing.span("parse"):
+            in_data = cls.parse(in_str)
+    Spans can be nested, and are shown as a stack on the timeline. While tracing is disabled,
+    this returns a shared context manager that does nothing, so spans cost almost nothing.
+
+    Args:
+        name: The name of the span, shown on the timeline
+        **args: Any extra details to attach to the span, e.g. the part or the input's label
+
+    Returns:
+        A context manager which records the span when it exits
+    """
+    if not enabled:
+        return _NO_SPAN
+    return _Span(name, args)
+
+def write(filename: str) -> None:
+    """
+    Write the recorded events to a file, as Chrome trace-event JSON
+
+    Args:
+        filename: The path of the file to write
+    """
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
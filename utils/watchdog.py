@@ -0,0 +1,265 @@
+"""
+A module for running the parts of a day within a time and memory budget, so that a pathological
+input reports how far it got instead of stalling everything after it. Budgets are enforced with
+SIGALRM and setrlimit, so this only works on Unix.
+"""
+import multiprocessing
+import resource
+import signal
+from contextlib import contextmanager
+from typing import Iterator
+from utils import progress, stats
+from utils.abstract_day import Day
+
+# How long to wait past the timeout for a part to report its partial counters before killing
+# it, in case it's stuck somewhere that the timeout's signal can't interrupt (e.g. inside C code)
+GRACE_PERIOD = 1.0
+
+class PartTimeout(Exception):
+    """
+    Raised inside a part when it runs out of time
+    """
+
+def _raise_timeout(_signum, _frame) -> None:
+    """
+    Signal handler for SIGALRM, which interrupts whatever is running when the budget runs out
+
+    Raises:
+        PartTimeout: Always
+    """
+    raise PartTimeout()
+
+@contextmanager
+def budget(timeout: float | None = None, max_mem: int | None = None) -> Iterator[None]:
+    """
+    Limit the time and memory of a block of code in the current process. Running out of time
+    raises PartTimeout inside the block, and running out of memory raises MemoryError. Both
+    limits are lifted again when the block exits. This must be used from the main thread.
+
+    Args:
+        timeout: The most wall-clock time the block can take, in seconds, or None for no limit
+        max_mem: The most memory the process can have mapped while the block runs (i.e. its
+        whole address space, including the interpreter), in bytes, or None for no limit
+    """
+    old_handler = None
+    old_limit = None
+    if timeout is not None:
+        old_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    if max_mem is not None:
+        old_limit = resource.getrlimit(resource.RLIMIT_AS)
+        hard_limit = old_limit[1]
+        if hard_limit != resource.RLIM_INFINITY:
+            max_mem = min(max_mem, hard_limit)
+        resource.setrlimit(resource.RLIMIT_AS, (max_mem, hard_limit))
+    try:
+        yield
+    finally:
+        if timeout is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, old_handler)
+        if old_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, old_limit)
+
+class _RecordingReporter(progress.Reporter):
+    """
+    Remembers the latest progress of any loop, so that it can be reported if a part runs out
+    of its budget, and passes it on to another reporter if progress is being shown
+    """
+    def __init__(self, inner: progress.Reporter | None):
+        super().__init__()
+        self.inner = inner
+        self.latest: dict | None = None
+
+    def update(self, label: str, done: int, total: int | None, elapsed: float) -> None:
+        self.latest = {"label": label, "done": done, "total": total}
+        if self.inner is not None:
+            self.inner.update(label, done, total, elapsed)
+
+    def finish(self) -> None:
+        if self.inner is not None:
+            self.inner.finish()
+
+_recorder = _RecordingReporter(None)
+
+def start_recording() -> None:
+    """
+    Start recording the counters and progress of everything run in this process, so that
+    partial_state() can report how far a part got. Counting slows down some days slightly.
+    """
+    global _recorder # pylint: disable=global-statement
+    _recorder = _RecordingReporter(progress.reporter if progress.is_enabled() else None)
+    progress.reporter = _recorder
+    progress.enabled = True
+    stats.enable()
+
+def reset_recording() -> None:
+    """
+    Clear the recorded counters and progress, e.g. before starting the next part
+    """
+    stats.reset()
+    _recorder.latest = None
+
+def partial_state() -> dict:
+    """
+    Get the counters and progress recorded since the last reset_recording()
+
+    Returns:
+        A dict of the "counters" (a dict of each counter's value) and the "progress" of the
+        latest loop (a dict of its label, the items done and the total), or None if there
+        wasn't one
+    """
+    return {"counters": dict(stats.counters), "progress": _recorder.latest}
+
+def _run_part(day_code: type[Day], in_str: str, part: int, timeout: float | None,
+              max_mem: int | None, conn) -> None:
+    """
+    Parse the input and run one part of a day within a budget, in a child process, and send
+    the result back to the parent
+
+    Args:
+        day_code: The day to run
+        in_str: The input string from AOC
+        part: The part to run (1 or 2)
+        timeout: The time budget in seconds, or None for no limit
+        max_mem: The memory budget in bytes, or None for no limit
+        conn: The end of a pipe to send the result to. See run_part() for its format.
+    """
+    # The parent passes everything the child needs through the Process's args
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    start_recording()
+    result = {"status": "ok", "output": None}
+    try:
+        with budget(timeout, max_mem):
+            in_data = day_code.parse(in_str)
+            func = day_code.part_1 if part == 1 else day_code.part_2
+            result["output"] = str(func(in_data))
+    except PartTimeout:
+        result["status"] = "timeout"
+    except MemoryError:
+        result["status"] = "memory"
+    # The days can raise anything for a bad input, which the parent should report
+    except Exception as e: # pylint: disable=broad-exception-caught
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result.update(partial_state())
+    conn.send(result)
+    conn.close()
+
+def run_part(day_code: type[Day], in_str: str, part: int, timeout: float | None = None,
+             max_mem: int | None = None) -> dict:
+    """
+    Run one part of a day in a child process within a budget. The child stops itself when it
+    runs out of time or memory, and reports its counters and progress so far. If it doesn't
+    respond within GRACE_PERIOD of the timeout, it's killed.
+
+    Args:
+        day_code: The day to run
+        in_str: The input string from AOC
+        part: The part to run (1 or 2)
+        timeout: The most time the part (including parsing) can take, in seconds, or None
+        for no limit
+        max_mem: The most memory the child process can use, in bytes, or None for no limit
+
+    Returns:
+        The result, as a dict with:
+            status - "ok", "timeout", "memory" (out of memory) or "error"
+            output - The part's output, or None if it didn't finish
+            counters - The counters recorded while it ran, which are empty if it was killed
+            progress - The latest progress of any loop it ran, see partial_state()
+            error - For errors, a description of what went wrong
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_run_part,
+                                      args=(day_code, in_str, part, timeout, max_mem, sender))
+    process.start()
+    sender.close()
+    wait = None if timeout is None else timeout + GRACE_PERIOD
+    result = None
+    killed = False
+    if receiver.poll(wait):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            # The child died without reporting, e.g. it was killed by the system
+            pass
+    else:
+        process.kill()
+        killed = True
+    process.join()
+    receiver.close()
+    if result is None:
+        if killed:
+            result = {"status": "timeout"}
+        else:
+            result = {"status": "error", "error": f"exited with code {process.exitcode}"}
+        result.update({"output": None, "counters": {}, "progress": None})
+    return result
+
+def out_of_memory(max_mem: int | None) -> str:
+    """
+    Describe running out of memory. Code can run out of memory without a budget, e.g. if the
+    system can't give it any more, so there isn't always a limit to mention.
+
+    Args:
+        max_mem: The memory budget it ran with, in bytes, or None if there wasn't one
+
+    Returns:
+        The description, e.g. "ran out of memory (limit 200 MiB)"
+    """
+    if max_mem is None:
+        return "ran out of memory"
+    return f"ran out of memory (limit {max_mem / (1024 * 1024):g} MiB)"
+
+def describe(result: dict, timeout: float | None, max_mem: int | None) -> str:
+    """
+    Describe the result of a part that didn't finish, including how far it got
+
+    Args:
+        result: The result, from run_part()
+        timeout: The time budget it ran with, in seconds
+        max_mem: The memory budget it ran with, in bytes, or None if there wasn't one
+
+    Returns:
+        A one-line description, e.g. "timed out after 10s (at Calculating: 45/100)"
+    """
+    if result["status"] == "timeout":
+        message = f"timed out after {timeout:g}s"
+    elif result["status"] == "memory":
+        message = out_of_memory(max_mem)
+    else:
+        message = f"failed ({result['error']})"
+    details = []
+    if result["progress"] is not None:
+        loop = result["progress"]
+        done = f"{loop['done']:,}" + (f"/{loop['total']:,}" if loop["total"] else "")
+        details.append(f"at {loop['label']}: {done}")
+    details.extend(f"{name}: {value:,}" for name, value in sorted(result["counters"].items()))
+    if details:
+        message += f" ({', '.join(details)})"
+    return message
+
+def budget_parts(day_code: type[Day], in_str: str, timeout: float | None = None,
+                 max_mem: int | None = None) -> tuple[str, str]:
+    """
+    Run each part of a day in its own child process within a budget. A part that runs out of
+    its budget doesn't stop the other part from running.
+
+    Args:
+        day_code: The day to run
+        in_str: The input string from AOC
+        timeout: The most time each part can take, in seconds, or None for no limit
+        max_mem: The most memory each part's process can use, in bytes, or None for no limit
+
+    Returns:
+        The outputs for part 1 and part 2, as strings. A part that didn't finish is described
+        instead, see describe().
+    """
+    outputs = []
+    for part in (1, 2):
+        result = run_part(day_code, in_str, part, timeout, max_mem)
+        if result["status"] == "ok":
+            outputs.append(result["output"])
+        else:
+            outputs.append(describe(result, timeout, max_mem))
+    return tuple(outputs)